@@ -48,6 +48,7 @@ __all__ = [
     "strip_punction_from_datetime_str",
     "DEFAULT_MARIADB_DB_NAME",
     "DEFAULT_MARIADB_CNF",
+    "DEFAULT_MARIADB_POOL_SIZE",
     "DEFAULT_KEY_LENGTHS",
     "TEST_MARIADB_DB_NAME",
     "__version__",
@@ -70,6 +71,8 @@ DEFAULT_MARIADB_CNF: Final[str] = "moduli_generator.cnf"
 DEFAULT_MARIADB_DB_NAME: Final[str] = "moduli_db"
 DEFAULT_MARIADB_TABLE: Final[str] = "moduli"
 DEFAULT_MARIADB_VIEW: Final[str] = "moduli_view"
+# Connections held by MariaDBConnector's pool (MariaDB Connector/Python allows at most 64)
+DEFAULT_MARIADB_POOL_SIZE: Final[int] = 10
 
 # Flag to Delete Records from Moduli DB after successfully extracting and writing a complete ssh / moduli file
 DEFAULT_PRESERVE_MODULI_AFTER_DBSTORE: Final[bool] = False
@@ -223,6 +226,7 @@ class ModuliConfig:
         self.table_name = DEFAULT_MARIADB_TABLE
         self.view_name = DEFAULT_MARIADB_VIEW
         self.records_per_keylength = DEFAULT_MODULI_RECORDS_PER_KEYLENGTH
+        self.pool_size = DEFAULT_MARIADB_POOL_SIZE
 
         # Default Mariadb Configuration
         self.mariadb_cnf = self.moduli_home / DEFAULT_MARIADB_CNF
@@ -241,6 +245,9 @@ class ModuliConfig:
         self.privileged_tmp_cnf = CONST_PRIVILEGED_TMP_CNF
         self.password_length = CONST_MARIADB_PASSWORD_LENGTH
 
+        # Logger configured by the first `get_logger` call
+        self._logger = None
+
     def ensure_directories(self) -> "ModuliConfig":
         """
         Ensures that a set of directories (base, candidates, moduli, and log directories) exist.
@@ -268,7 +275,8 @@ class ModuliConfig:
                 before setting up the logging system. It verifies the existence of the base logging
                 directory, the default log directory, and the MariaDB configuration file. If they do not
                 exist, they are created as needed. Once these prerequisites are met, the logger is
-                configured with a specific logging level, format, and file output.
+                configured with a specific logging level, format, and file output. The configured
+                logger is kept, so later calls return it without repeating the setup.
 
         Returns:
             Logging.Logger: Configured logger instance.
@@ -277,6 +285,8 @@ class ModuliConfig:
             OSError: If there is an issue, create required directories or files.
             IOError: If there is an issue, read the default MariaDB configuration file.
         """
+        if self._logger is not None:
+            return self._logger
 
         if not self.moduli_home.exists():
             Path(self.moduli_home).mkdir(parents=True, exist_ok=True)
@@ -294,7 +304,8 @@ class ModuliConfig:
             filename=Path(self.log_file),
             filemode="a",
         )
-        return getLogger()
+        self._logger = getLogger()
+        return self._logger
 
     def get_log_file(self, name) -> Path:
         """
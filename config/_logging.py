@@ -0,0 +1,47 @@
+import atexit
+from logging import DEBUG, FileHandler, Formatter, StreamHandler, getLogger
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
+from typing import Optional
+
+__all__ = ["install_async_logging"]
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def install_async_logging(config: "ModuliConfig", level: int = DEBUG, console: bool = False) -> None:
+    """
+    Routes root logging to `config.log_file` through a queue drained by a background thread.
+
+            Like `logging.basicConfig`, this does nothing if the root logger already has handlers,
+            so it can replace a `basicConfig(filename=config.log_file, filemode="a")` call as is.
+            Log calls only enqueue the record; formatting and file writes happen on the listener
+            thread, which is stopped (and the queue flushed) at interpreter exit.
+
+    Args:
+        config (ModuliConfig): Configuration providing `log_file`.
+        level (int): Root logger level. Defaults to DEBUG.
+        console (bool): Also echo each message, unformatted, to stderr. Defaults to False.
+    """
+    global _listener
+    root = getLogger()
+    if root.handlers:
+        return
+
+    # The log file is opened on the first record, so runs that log nothing never touch it
+    file_handler = FileHandler(config.log_file, mode="a", delay=True)
+    file_handler.setFormatter(Formatter(LOG_FORMAT))
+
+    # Unbounded, so a burst of records is never dropped while the file catches up
+    log_queue = SimpleQueue()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+    if console:
+        # Console output stays synchronous so progress lines appear as they happen
+        root.addHandler(StreamHandler())
+
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
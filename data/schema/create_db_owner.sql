@@ -1,8 +1,6 @@
 CREATE USER IF NOT EXISTS 'moduli_generator'@'%'
 IDENTIFIED BY '<MODULI_GENERATOR_PASSWORD>'
-WITH MAX_QUERIES_PER_HOUR 500
-MAX_CONNECTIONS_PER_HOUR 100
-MAX_UPDATES_PER_HOUR 200
-MAX_USER_CONNECTIONS 50;
-GRANT ALL PRIVILEGES ON moduli_db.* TO 'moduli_generator'@'%' WITH GRANT OPTION;
-FLUSH PRIVILEGES;
\ No newline at end of file
+WITH MAX_CONNECTIONS_PER_HOUR 0
+MAX_UPDATES_PER_HOUR 0
+MAX_USER_CONNECTIONS 0;
+GRANT ALL PRIVILEGES ON moduli_db.* TO 'moduli_generator'@'%' WITH GRANT OPTION;
\ No newline at end of file
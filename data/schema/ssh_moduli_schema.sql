@@ -17,7 +17,8 @@ CREATE TABLE IF NOT EXISTS moduli_db.moduli (
     config_id TINYINT UNSIGNED NOT NULL COMMENT 'Foreign key to moduli constants',
     size INT UNSIGNED NOT NULL COMMENT 'Key size in bits',
     modulus TEXT NOT NULL COMMENT 'Prime modulus value',
-    modulus_hash VARCHAR(128) GENERATED ALWAYS AS (SHA2(modulus, 512)) STORED COMMENT 'Hash of modulus for uniqueness check',
+    modulus_hash BINARY(64) NOT NULL COMMENT 'SHA-512 of modulus for uniqueness check, computed by the client',
+    sample_id BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'Random key for indexed sampling',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (config_id) REFERENCES mod_fl_consts(config_id),
     UNIQUE KEY (modulus_hash)
@@ -45,7 +46,7 @@ CREATE TABLE IF NOT EXISTS moduli_db.moduli_archive
     config_id    TINYINT UNSIGNED NOT NULL COMMENT 'Foreign key to moduli constants',
     size         INT UNSIGNED     NOT NULL COMMENT 'Key size in bits',
     modulus      TEXT             NOT NULL COMMENT 'Prime modulus value',
-    modulus_hash VARCHAR(128) GENERATED ALWAYS AS (SHA2(modulus, 512)) STORED COMMENT 'Hash of modulus for uniqueness check',
+    modulus_hash BINARY(64) NOT NULL COMMENT 'SHA-512 of modulus for uniqueness check, computed by the client',
     created_at   TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (config_id) REFERENCES mod_fl_consts (config_id),
     UNIQUE KEY (modulus_hash)
@@ -66,6 +67,7 @@ FROM moduli_db.moduli_archive m
 -- Indexes for commonly queried fields
 CREATE INDEX idx_size ON moduli_db.moduli(size);
 CREATE INDEX idx_timestamp ON moduli_db.moduli(timestamp);
+CREATE INDEX idx_size_sample ON moduli_db.moduli(size, sample_id);
 
 -- Indexes for archive table (identical to main table)
 CREATE INDEX idx_size_archive ON moduli_db.moduli_archive (size);
@@ -1,12 +1,22 @@
+import copy
+import math
+import os
+import re
+import secrets
+import tempfile
+import threading
 import warnings
-from contextlib import contextmanager
+from contextlib import ExitStack, closing, contextmanager
+from functools import lru_cache
+from itertools import count, groupby
 from pathlib import PosixPath as Path
 from socket import getfqdn
 from typing import Any, Dict, Final, List, Optional
 
 # Conditionally import mariadb for documentation builds
 try:
-    from mariadb import ConnectionPool, Error
+    from mariadb import ConnectionPool, Error, connect
+    from mariadb.constants import CLIENT
 
     HAS_MARIADB = True
 except ImportError:
@@ -21,6 +31,8 @@ except ImportError:
 
     ConnectionPool = ConnectionPoolMock
     Error = ErrorMock
+    connect = None
+    CLIENT = None
     HAS_MARIADB = False
     warnings.warn("MariaDB module not available. Database functionality will be limited.",
                   ImportWarning)
@@ -29,12 +41,14 @@ from typing_extensions import ContextManager
 
 from config import (
     DEFAULT_KEY_LENGTHS,
+    DEFAULT_MARIADB_POOL_SIZE,
     ModuliConfig,
     default_config,
     iso_utc_timestamp,
     strip_punction_from_datetime_str
 )
 from db.common import (
+    compute_modulus_hash,
     is_valid_identifier_sql,
     parse_mysql_config,
     get_mysql_config_value
@@ -58,6 +72,23 @@ DEFAULT_MARIADB_PASSWORD: Final[str] = None
 DEFAULT_MARIADB_SSL: Final[bool] = True
 DEFAULT_MARIADB_SOCKET: Final[str] = "/var/run/mysqld/mysqld.sock"
 
+
+_CLONE_POOL_IDS = count(1)  # Unique pool names for cloned connectors
+
+DEFAULT_BULK_LOAD_THRESHOLD: Final[int] = 10000  # Records at which LOAD DATA replaces INSERTs
+# Server and client error numbers raised when LOAD DATA LOCAL INFILE is disabled
+_LOCAL_INFILE_DISABLED_ERRNOS: Final[frozenset] = frozenset({1148, 2068, 3948, 4166})
+# Duplicate-key warning, the only row error `LOAD DATA ... IGNORE` is expected to skip
+_DUPLICATE_KEY_ERRNO: Final[int] = 1062
+# Keep every warning of a bulk load for SHOW WARNINGS, not only the default first 64
+_BULK_LOAD_MAX_ERROR_COUNT: Final[int] = 65535
+MIN_PIPELINE_SERVER_VERSION: Final[int] = 100200  # MariaDB 10.2: pipelined PREPARE+EXECUTE
+# Quoted strings, quoted identifiers and comments are matched whole so only a top-level `%s` is a placeholder
+_PLACEHOLDER_RE: Final[re.Pattern] = re.compile(
+    r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`|--(?=\s|$)[^\n]*|#[^\n]*|/\*.*?\*/|(%s)""",
+    re.DOTALL,
+)
+
 __all__ = [
     "MariaDBConnector",
     "parse_mysql_config",
@@ -66,6 +97,13 @@ __all__ = [
 ]
 
 
+@lru_cache(maxsize=8)
+def _load_mariadb_cnf(mysql_cnf: Path, mtime_ns: int) -> Dict[str, Dict[str, str]]:
+    """
+    Parses a MariaDB configuration file, memoized on its path and modification time so
+    repeated connector construction does not re-read an unchanged file.
+    """
+    return parse_mysql_config(mysql_cnf)
 
 
 class MariaDBConnector:
@@ -121,6 +159,13 @@ class MariaDBConnector:
         Returns:
             bool: Returns False to re-raise any exception encountered in the context
         """
+        if getattr(self, "_multi_statement_conn", None) is not None:
+            try:
+                self._multi_statement_conn.close()
+                self.logger.debug("Multi-statement connection closed")
+            except Error as err:
+                self.logger.error(f"Error closing multi-statement connection: {err}")
+            self._multi_statement_conn = None
         if hasattr(self, "pool") and self.pool:
             try:
                 self.pool.close()
@@ -151,6 +196,8 @@ class MariaDBConnector:
         connection = None
         try:
             connection = self.pool.get_connection()
+            # Safety net: a reset pooled connection must not fall back to autocommit
+            connection.autocommit = False
             yield connection
         except Error as err:
             # Only catch and handle errors that are specifically about connection failures
@@ -172,6 +219,38 @@ class MariaDBConnector:
             if connection:
                 connection.close()  # Returns connection to pool
 
+    @contextmanager
+    def multi_statement_connection(self) -> ContextManager:
+        """
+        Provides a context manager for a dedicated connection with the multi-statement
+                capability (`CLIENT_MULTI_STATEMENTS`) enabled. Pooled connections never carry
+                this flag. The dedicated connection is opened on first use and reused by later
+                calls, so the connection handshake happens once per connector; it is discarded
+                after a database error and closed when the connector's context exits.
+
+        Returns:
+            Connection: Yields a connection that accepts `;`-separated statements.
+
+        Raises:
+            RuntimeError: If running in documentation-only mode
+        """
+        if not HAS_MARIADB or self.pool is None:
+            self.logger.warning("Cannot get database connection in documentation-only mode")
+            raise RuntimeError("Database functionality not available in documentation-only mode")
+
+        with self._multi_statement_lock:
+            if self._multi_statement_conn is None:
+                self._multi_statement_conn = connect(
+                    **self._connect_params, client_flag=CLIENT.MULTI_STATEMENTS
+                )
+            try:
+                yield self._multi_statement_conn
+            except Error:
+                # The connection state is unknown after a driver error; reconnect next time
+                self._multi_statement_conn.close()
+                self._multi_statement_conn = None
+                raise
+
     @contextmanager
     def transaction(self, connection: "MariaDBConnector" = None) -> ContextManager:
         """
@@ -256,6 +335,7 @@ class MariaDBConnector:
                 "records_per_keylength",
                 "delete_records_on_moduli_write",
                 "config_id",
+                "pool_size",
             ]:
                 setattr(self, key, value)
 
@@ -269,6 +349,27 @@ class MariaDBConnector:
         self.logger.debug(f"Using MariaDB config: {config.mariadb_cnf}")
         self.records_per_keylength = config.records_per_keylength
 
+        # Validate identifiers once. Insert, load and read queries interpolate `db_name.table_name`;
+        # `view_name` is not used in any query, so an invalid one does not block them
+        invalid = {
+            attribute
+            for attribute in ("db_name", "table_name", "view_name")
+            if not is_valid_identifier_sql(getattr(self, attribute, None))
+        }
+        if invalid:
+            self.logger.error(
+                "Invalid " + ", ".join(f"{attribute}: {getattr(self, attribute, None)}" for attribute in sorted(invalid))
+            )
+        self._table_identifiers_valid = invalid.isdisjoint(("db_name", "table_name"))
+        self._valid_table_names = set()
+
+        # Moduli files are written for DEFAULT_KEY_LENGTHS; produced sizes are `key_length - 1`
+        self._moduli_query_sizes = tuple(key_length - 1 for key_length in DEFAULT_KEY_LENGTHS)
+
+        # Dedicated multi-statement connection, opened lazily by multi_statement_connection()
+        self._multi_statement_conn = None
+        self._multi_statement_lock = threading.Lock()
+
         # Check if running in documentation-only mode
         if not HAS_MARIADB:
             self.logger.warning("Running in documentation-only mode. Database functionality is not available.")
@@ -276,7 +377,12 @@ class MariaDBConnector:
             return
 
         # Parse MySQL configuration with defensive handling - THIS IS THE PRIVILEGED USER!
-        parsed_config = parse_mysql_config(config.mariadb_cnf)
+        try:
+            cnf_mtime_ns = os.stat(config.mariadb_cnf).st_mtime_ns
+        except (OSError, TypeError):
+            parsed_config = parse_mysql_config(config.mariadb_cnf)
+        else:
+            parsed_config = _load_mariadb_cnf(config.mariadb_cnf, cnf_mtime_ns)
         if not isinstance(parsed_config, dict):
             raise RuntimeError(
                 f"Invalid configuration format in {config.mariadb_cnf}: expected dictionary, got {type(parsed_config)}"
@@ -293,18 +399,24 @@ class MariaDBConnector:
         mysql_cnf = parsed_config["client"]
 
         try:
-            # Create connection pool instead of single connection
-            pool_params = {
-                "pool_name": "moduli_pool",
-                "pool_size": 10,  # Adjust based on your needs
-                "pool_reset_connection": True,
+            # Connection parameters shared by the pool and dedicated connections
+            self._connect_params = {
                 "host": mysql_cnf["host"],
                 "port": int(mysql_cnf.get("port", DEFAULT_MARIADB_PORT)),
                 "user": mysql_cnf["user"],
                 "password": mysql_cnf["password"],
+                "autocommit": False,  # Commit once per transaction(), not per statement
+            }
+            # Create connection pool instead of single connection
+            pool_size = getattr(self, "pool_size", DEFAULT_MARIADB_POOL_SIZE)
+            pool_params = {
+                "pool_name": "moduli_pool",
+                "pool_size": pool_size,
+                "pool_reset_connection": True,
+                **self._connect_params,
             }
             self.pool = ConnectionPool(**pool_params)
-            self.logger.info(f"Connection pool created with size: 10")
+            self.logger.info(f"Connection pool created with size: {pool_size}")
 
         except Error as err:
             self.logger.error(f"Error creating connection pool: {err}")
@@ -313,6 +425,37 @@ class MariaDBConnector:
         # Validate DB Schema Prior to completion of object instantiation
         self._verify_schema_with_logging(config)
 
+    def clone(self, pool_size: int = 4) -> "MariaDBConnector":
+        """
+        Creates a connector that shares this instance's configuration but owns a separate,
+                smaller connection pool. The parsed `mariadb_cnf` connection parameters are reused,
+                so the configuration file is not re-read and the schema is not re-verified.
+
+        Args:
+            pool_size (int): Number of connections in the cloned pool. Defaults to 4.
+
+        Returns:
+            MariaDBConnector: A new connector; use it as a context manager to close its pool.
+
+        Raises:
+            RuntimeError: If running in documentation-only mode
+        """
+        if not HAS_MARIADB or self.pool is None:
+            self.logger.warning("Cannot clone connector in documentation-only mode")
+            raise RuntimeError("Database functionality not available in documentation-only mode")
+
+        cloned = copy.copy(self)
+        cloned._multi_statement_conn = None
+        cloned._multi_statement_lock = threading.Lock()
+        cloned.pool = ConnectionPool(
+            pool_name=f"moduli_pool_clone_{next(_CLONE_POOL_IDS)}",
+            pool_size=pool_size,
+            pool_reset_connection=True,
+            **self._connect_params,
+        )
+        self.logger.debug(f"Cloned connector with pool size: {pool_size}")
+        return cloned
+
     def _verify_schema_with_logging(self, config: ModuliConfig):
         """
         Verifies the schema of the configuration with appropriate logging.
@@ -483,7 +626,11 @@ class MariaDBConnector:
         """
         with self.get_connection() as connection:
             with self.transaction(connection):
-                with connection.cursor() as cursor:
+                # Statement cache keyed on SQL text: each distinct parameterized query is
+                # prepared once per batch and closed (COM_STMT_CLOSE) when the batch ends
+                with ExitStack() as cursors:
+                    text_cursor = None
+                    prepared_cursors = {}
                     for i, query in enumerate(queries):
                         params = (
                             params_list[i]
@@ -491,14 +638,118 @@ class MariaDBConnector:
                             else None
                         )
                         if params:
+                            cursor = prepared_cursors.get(query)
+                            if cursor is None:
+                                cursor = prepared_cursors[query] = cursors.enter_context(
+                                    connection.cursor(prepared=True)
+                                )
                             cursor.execute(query, params)
                         else:
-                            cursor.execute(query)
+                            if text_cursor is None:
+                                text_cursor = cursors.enter_context(connection.cursor())
+                            text_cursor.execute(query)
                     self.logger.debug(
-                        f"Successfully executed {len(queries)} in batch"
+                        f"Successfully executed {len(queries)} in batch "
+                        f"({len(prepared_cursors)} prepared statements)"
                     )
                     return True
 
+    @db_operation(error_message="Script execution failed", reraise_as=QueryError)
+    def execute_script(self, statements: List[tuple], inline_params: bool = False) -> bool:
+        """
+        Execute an ordered list of statements on one connection within a single transaction.
+
+                Runs of parameterless statements are joined with `;` and sent as one packet over a
+                multi-statement connection. On MariaDB 10.2+ parameterized statements use a binary
+                cursor, so PREPARE and EXECUTE are pipelined, each distinct query is prepared
+                once, and consecutive runs of the same query are sent with `executemany`. Older
+                servers get the parameters interpolated client-side and the statement folded into
+                the multi-statement packet instead. The transaction is committed once at the end
+                and rolled back if any statement fails.
+
+        Args:
+            statements (List[tuple]): `(query, params)` pairs in execution order; `params` is
+                         None for parameterless statements.
+            inline_params (bool): Always interpolate parameters client-side, so the whole
+                         script is sent as a single packet. Defaults to False.
+
+        Returns:
+            bool: Boolean indicating whether the execution was successful.
+
+        Raises:
+            QueryError: If any statement fails.
+        """
+        with self.multi_statement_connection() as connection:
+            with self.transaction(connection):
+                pipelined = (
+                        not inline_params and connection.server_version >= MIN_PIPELINE_SERVER_VERSION
+                )
+                with ExitStack() as cursors:
+                    text_cursor = cursors.enter_context(connection.cursor())
+                    prepared_cursors = {}
+                    pending = []
+
+                    def send_pending():
+                        text_cursor.execute(";\n".join(pending))
+                        while text_cursor.nextset():
+                            pass
+                        pending.clear()
+
+                    for query, run in groupby(statements, key=lambda statement: statement[0]):
+                        params_list = [params for _, params in run]
+                        if pipelined and all(params_list):
+                            if pending:
+                                send_pending()
+                            cursor = prepared_cursors.get(query)
+                            if cursor is None:
+                                cursor = prepared_cursors[query] = cursors.enter_context(
+                                    connection.cursor(binary=True)
+                                )
+                            # Consecutive rows for one statement go out as a single bulk execute
+                            if len(params_list) > 1:
+                                cursor.executemany(query, params_list)
+                            else:
+                                cursor.execute(query, params_list[0])
+                            continue
+                        for params in params_list:
+                            statement = self._interpolate(connection, query, params) if params else query
+                            pending.append(statement.strip().rstrip(";"))
+
+                    if pending:
+                        send_pending()
+                    self.logger.debug(
+                        f"Successfully executed {len(statements)} statements in one transaction"
+                    )
+                    return True
+
+    @staticmethod
+    def _interpolate(connection, query: str, params: tuple) -> str:
+        """
+        Substitutes `%s` placeholders with escaped SQL literals, for servers that cannot pipeline
+        prepared statements. Supports None, finite numbers, bytes and strings; a `%s` inside a
+        quoted string, a quoted identifier or a comment is left as it is.
+        """
+        placeholders = [match for match in _PLACEHOLDER_RE.finditer(query) if match.group(1)]
+        if len(placeholders) != len(params):
+            raise ValueError(f"Expected {len(placeholders)} parameters, got {len(params)}")
+
+        pieces, position = [], 0
+        for match, value in zip(placeholders, params):
+            if value is None:
+                literal = "NULL"
+            elif isinstance(value, (bool, int, float)):
+                if isinstance(value, float) and not math.isfinite(value):
+                    raise ValueError(f"Cannot interpolate non-finite float {value!r}")
+                literal = str(int(value) if isinstance(value, bool) else value)
+            elif isinstance(value, (bytes, bytearray)):
+                literal = f"X'{bytes(value).hex()}'"
+            else:
+                literal = f"'{connection.escape_string(str(value))}'"
+            pieces += (query[position:match.start()], literal)
+            position = match.end()
+
+        return "".join(pieces) + query[position:]
+
     def _add_without_transaction(
             self, connection, timestamp: int, key_size: int, modulus: str
     ) -> int:
@@ -518,19 +769,18 @@ class MariaDBConnector:
         Raises:
             Error: If there is an issue during the database operation.
         """
-        # Validate identifiers
-        if not (
-                is_valid_identifier_sql(self.db_name)
-                and is_valid_identifier_sql(self.table_name)
-        ):
+        # The table identifiers are validated once in __init__
+        if not self._table_identifiers_valid:
             self.logger.error("Invalid database or table name")
             return 0
 
         try:
             with connection.cursor() as cursor:
                 table = ".".join((self.db_name, self.table_name))
-                query = f"INSERT INTO {table} (timestamp, config_id, size, modulus) VALUES (%s, %s, %s, %s)"
-                params_list = (timestamp, self.config_id, key_size, modulus)
+                query = f"INSERT INTO {table} (timestamp, config_id, size, modulus, modulus_hash, sample_id) VALUES (%s, %s, %s, %s, %s, %s)"
+                params_list = (
+                    timestamp, self.config_id, key_size, modulus, compute_modulus_hash(modulus), secrets.randbits(63)
+                )
                 cursor.execute(query, params_list)
                 last_id = cursor.lastrowid
                 return last_id
@@ -553,11 +803,8 @@ class MariaDBConnector:
         Returns:
             int: The identifier of the last inserted row if successful, otherwise 0.
         """
-        # Validate identifiers
-        if not (
-                is_valid_identifier_sql(self.db_name)
-                and is_valid_identifier_sql(self.table_name)
-        ):
+        # The table identifiers are validated once in __init__
+        if not self._table_identifiers_valid:
             self.logger.error("Invalid database or table name")
             return 0
 
@@ -566,8 +813,11 @@ class MariaDBConnector:
                 with self.transaction(connection):
                     with connection.cursor() as cursor:
                         table = ".".join((self.db_name, self.table_name))
-                        query = f"INSERT INTO {table} (timestamp, config_id, size, modulus) VALUES (%s, %s, %s, %s)"
-                        params_list = (timestamp, self.config_id, key_size, modulus)
+                        query = f"INSERT INTO {table} (timestamp, config_id, size, modulus, modulus_hash, sample_id) VALUES (%s, %s, %s, %s, %s, %s)"
+                        params_list = (
+                            timestamp, self.config_id, key_size, modulus, compute_modulus_hash(modulus),
+                            secrets.randbits(63)
+                        )
 
                         cursor.execute(query, params_list)
                         last_id = cursor.lastrowid
@@ -595,21 +845,18 @@ class MariaDBConnector:
             bool: A boolean indicating whether the batch operation was successful.
             Returns True if successful, False otherwise.
         """
-        if not (
-                is_valid_identifier_sql(self.db_name)
-                and is_valid_identifier_sql(self.table_name)
-        ):
+        if not self._table_identifiers_valid:
             self.logger.error("Invalid database or table name")
             return False
 
         table = ".".join((self.db_name, self.table_name))
         query = f"""
-                INSERT INTO {table} (timestamp, config_id, size, modulus)
-                VALUES (%s, %s, %s, %s) \
+                INSERT INTO {table} (timestamp, config_id, size, modulus, modulus_hash, sample_id)
+                VALUES (%s, %s, %s, %s, %s, %s) \
                 """
         # Prepare parameters for batch execution
         params_list = [
-            (timestamp, self.config_id, key_size, modulus)
+            (timestamp, self.config_id, key_size, modulus, compute_modulus_hash(modulus), secrets.randbits(63))
             for timestamp, key_size, modulus in records
         ]
 
@@ -624,6 +871,153 @@ class MariaDBConnector:
             self.logger.error(f"Error inserting batch records: {err}")
             return False
 
+    @db_operation(error_message="Bulk load execution failed", reraise_as=QueryError)
+    def load_batch(self, records: List[tuple]) -> int:
+        """
+        Bulk load a batch of records into the moduli table with `LOAD DATA LOCAL INFILE`.
+
+                The records are serialized into a tab-separated temporary file and loaded in a
+                single statement, bypassing per-row SQL parsing. Duplicate moduli are skipped
+                (`IGNORE`), matching the duplicate handling of `export_screened_moduli`. Since
+                `IGNORE` also downgrades every other row error to a warning, the load's
+                warnings are read back and any other than a duplicate key rolls it back. The
+                load runs on a dedicated connection opened with `local_infile` enabled, so
+                pooled connections never accept LOCAL INFILE requests, and is committed once
+                at the end.
+
+        Args:
+            records (List[tuple]): A list of tuples, where each tuple contains the timestamp,
+                         key size, and modulus values of a record.
+
+        Returns:
+            int: The number of records loaded, or 0 if the database or table name is invalid.
+
+        Raises:
+            QueryError: If the bulk load fails or a row is rejected other than as a duplicate.
+            RuntimeError: If running in documentation-only mode
+        """
+        if not self._table_identifiers_valid:
+            self.logger.error("Invalid database or table name")
+            return 0
+
+        if not HAS_MARIADB or self.pool is None:
+            self.logger.warning("Cannot get database connection in documentation-only mode")
+            raise RuntimeError("Database functionality not available in documentation-only mode")
+
+        with tempfile.NamedTemporaryFile(
+                "w", prefix="moduli_", suffix=".tsv", delete=False
+        ) as tsv_file:
+            tsv_file.write(
+                "".join(
+                    f"{timestamp}\t{self.config_id}\t{key_size}\t{modulus}\t"
+                    f"{compute_modulus_hash(modulus).hex()}\t{secrets.randbits(63)}\n"
+                    for timestamp, key_size, modulus in records
+                )
+            )
+        tsv_path = Path(tsv_file.name)
+
+        try:
+            table = ".".join((self.db_name, self.table_name))
+            # The file name of LOAD DATA cannot be parameterized; escape it as a string literal
+            infile = str(tsv_path).replace("'", "''")
+            query = (
+                f"LOAD DATA LOCAL INFILE '{infile}' "
+                f"IGNORE INTO TABLE {table} "
+                f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+                f"(timestamp, config_id, size, modulus, @modulus_hash, sample_id) "
+                f"SET modulus_hash = UNHEX(@modulus_hash)"
+            )
+            with closing(
+                    connect(
+                        **self._connect_params,
+                        local_infile=True,
+                        init_command=f"SET SESSION max_error_count = {_BULK_LOAD_MAX_ERROR_COUNT}",
+                    )
+            ) as connection:
+                with self.transaction(connection):
+                    with connection.cursor() as cursor:
+                        cursor.execute(query)
+                        loaded = cursor.rowcount
+                        if cursor.warnings:
+                            self._check_load_warnings(cursor)
+            self.logger.info(
+                f"Bulk loaded {loaded} of {len(records)} records into {table}"
+            )
+            return loaded
+        finally:
+            tsv_path.unlink(missing_ok=True)
+
+    def _check_load_warnings(self, cursor) -> None:
+        """
+        Raises if the warnings of the statement just executed on `cursor` include anything other
+                than duplicate keys, which `LOAD DATA ... IGNORE` reports for every skipped row.
+
+        Args:
+            cursor: The cursor that executed the `LOAD DATA` statement.
+
+        Raises:
+            QueryError: If a row was rejected for any reason other than a duplicate key, or if
+                not every warning could be read back.
+        """
+        expected = cursor.warnings
+        cursor.execute("SHOW WARNINGS")
+        rows = cursor.fetchall()
+        rejected = [(code, message) for _, code, message in rows if code != _DUPLICATE_KEY_ERRNO]
+        if rejected:
+            code, message = rejected[0]
+            raise QueryError(f"Bulk load rejected {len(rejected)} rows: {message} ({code})")
+        if len(rows) < expected:
+            raise QueryError(f"Bulk load raised {expected} warnings but only {len(rows)} could be checked")
+        self.logger.debug(f"Bulk load skipped {len(rows)} duplicate moduli")
+
+    @db_operation(error_message="Batch insert execution failed", reraise_as=QueryError)
+    def insert_batch(self, records: List[tuple]) -> int:
+        """
+        Insert a batch of records into the moduli table with a single `executemany`.
+
+                The fallback of `export_screened_moduli` when the server or client has
+                `LOAD DATA LOCAL INFILE` disabled. Duplicate moduli are skipped (`INSERT
+                IGNORE`), as with `load_batch`, and the batch is committed once at the end.
+
+        Args:
+            records (List[tuple]): A list of tuples, where each tuple contains the timestamp,
+                         key size, and modulus values of a record.
+
+        Returns:
+            int: The number of records inserted, or 0 if the database or table name is invalid.
+
+        Raises:
+            QueryError: If the batch insert fails.
+        """
+        if not self._table_identifiers_valid:
+            self.logger.error("Invalid database or table name")
+            return 0
+
+        table = ".".join((self.db_name, self.table_name))
+        query = (
+            f"INSERT IGNORE INTO {table} "
+            f"(timestamp, config_id, size, modulus, modulus_hash, sample_id) "
+            f"VALUES (%s, %s, %s, %s, %s, %s)"
+        )
+        params = [
+            (
+                timestamp,
+                self.config_id,
+                key_size,
+                modulus,
+                compute_modulus_hash(modulus),
+                secrets.randbits(63),
+            )
+            for timestamp, key_size, modulus in records
+        ]
+        with self.get_connection() as connection:
+            with self.transaction(connection):
+                with connection.cursor() as cursor:
+                    cursor.executemany(query, params)
+                    inserted = cursor.rowcount
+        self.logger.info(f"Inserted {inserted} of {len(records)} records into {table}")
+        return inserted
+
     def delete_records(self, table_name, where_clause=None) -> int:
         """
         Deletes records from a specified table in the database. Validates the table name
@@ -646,9 +1040,11 @@ class MariaDBConnector:
                 executing the delete operation.
         """
         try:
-            # Validate table name to prevent SQL injection
-            if not is_valid_identifier_sql(table_name):
-                raise RuntimeError(f"Invalid table name: {table_name}")
+            # Validate table name to prevent SQL injection, once per table name
+            if table_name not in self._valid_table_names:
+                if not is_valid_identifier_sql(table_name):
+                    raise RuntimeError(f"Invalid table name: {table_name}")
+                self._valid_table_names.add(table_name)
 
             with self.get_connection() as connection:
                 with self.transaction(connection):
@@ -688,6 +1084,35 @@ class MariaDBConnector:
             int: An integer indicating the status of the operation,
             where 0 indicates success and 1 indicates failure.
         """
+        records = [
+            (modulus["timestamp"], modulus["key-size"], modulus["modulus"])
+            for moduli_list in screened_moduli.values()
+            for modulus in moduli_list
+        ]
+        if len(records) >= DEFAULT_BULK_LOAD_THRESHOLD:
+            # Large exports bypass per-row INSERT parsing entirely
+            if not self._table_identifiers_valid:
+                self.logger.error("Error storing moduli: invalid database or table name")
+                return 1
+            try:
+                try:
+                    stored = self.load_batch(records)
+                except QueryError as err:
+                    if getattr(err.__cause__, "errno", None) not in _LOCAL_INFILE_DISABLED_ERRNOS:
+                        raise
+                    self.logger.warning(
+                        f"LOAD DATA LOCAL INFILE is disabled, inserting with executemany: {err}"
+                    )
+                    stored = self.insert_batch(records)
+            except (QueryError, RuntimeError) as err:
+                self.logger.error(f"Error storing moduli: {err}")
+                return 1
+            if stored < len(records):
+                self.logger.warning(
+                    f"Skipped {len(records) - stored} duplicate moduli of {len(records)}"
+                )
+            return 0
+
         with self.get_connection() as connection:
             with self.transaction(connection):
                 for key, moduli_list in screened_moduli.items():
@@ -729,12 +1154,8 @@ class MariaDBConnector:
             # Get the output file path from instance attributes
             output_file = self.moduli_home / ''.join(("ssh2-moduli_", iso_utc_timestamp(compress=True)))
 
-            # Validate identifiers
-            if not (
-                    is_valid_identifier_sql(self.db_name)
-                    and is_valid_identifier_sql(self.table_name)
-                    and is_valid_identifier_sql(self.view_name)
-            ):
+            # The table identifiers are validated once in __init__
+            if not self._table_identifiers_valid:
                 # Format error message to match test expectations
                 raise RuntimeError(
                     f"Invalid database, table, or view name: {self.db_name}, {self.table_name}, {self.view_name}"
@@ -742,42 +1163,60 @@ class MariaDBConnector:
 
             # Get Hostname
             hostname = getfqdn()
-            with open(output_file, "w") as f:
-                # Write header
+            with open(output_file, "wb") as f:
+                # Header; the whole file is encoded and written with a single write()
                 local_timestamp = iso_utc_timestamp(compress=False) + "Z"
-                f.write(
+                lines = [
                     f"# {hostname}::ModuliGenerator: ssh2 moduli generated at {local_timestamp}\n"
-                )
+                ]
 
                 """
                 Convert key_lengths to the length of PRODUCED size, usually `key_length - 1`)
                 Using DEFAULT_KEY_LENGTHS as we output RECORDS_PER_MODULI_FILE for each
                 of (3072 4096 6144, 7680, 8192)
                 """
-                size_params = [key_length - 1 for key_length in DEFAULT_KEY_LENGTHS]
-                size_placeholders = ",".join(
-                    ["%s"] * len(size_params)
-                )  # We need 1 less than the requested size
+                size_params = self._moduli_query_sizes
 
-                # Build a single SQL query to get all records for all key sizes
-                # Create a CASE statement for LIMIT per size based on records_per_keylength
+                # Build a single SQL query to get a random sample of records for all key sizes
                 table = ".".join((self.db_name, self.table_name))
 
-                # Use a window function with ROW_NUMBER to limit records per size
-                query = f"""
-                SELECT timestamp, size, modulus
-                FROM (
-                    SELECT timestamp, size, modulus,
-                           ROW_NUMBER() OVER (PARTITION BY size ORDER BY RAND()) as rn
-                    FROM {table}
-                    WHERE size IN ({size_placeholders})
-                ) ranked
-                WHERE rn <= %s
-                ORDER BY size, rn
-                """
+                # Random sampling via the indexed `sample_id` column: each key size reads
+                # `records_per_keylength` rows at or after a random seed (wrapping to the start
+                # of the range when the tail is short) instead of sorting the table on RAND()
+                seed = secrets.randbits(63)
+                sample_query = (
+                    f"(SELECT timestamp, size, modulus, sample_id FROM {table} "
+                    f"WHERE size = %s AND sample_id >= %s ORDER BY sample_id LIMIT %s) "
+                    f"UNION ALL "
+                    f"(SELECT timestamp, size, modulus, sample_id FROM {table} "
+                    f"WHERE size = %s AND sample_id < %s ORDER BY sample_id LIMIT %s)"
+                )
+                query = " UNION ALL ".join([sample_query] * len(size_params))
+
+                params = tuple(
+                    param
+                    for size in size_params
+                    for param in (
+                        size, seed, self.records_per_keylength,
+                        size, seed, self.records_per_keylength,
+                    )
+                )
+                sampled = sorted(
+                    self.execute_select(query, params),
+                    key=lambda row: (
+                        row["size"],
+                        row.get("sample_id", 0) < seed,
+                        row.get("sample_id", 0),
+                    ),
+                )
 
-                params = tuple(size_params + [self.records_per_keylength])
-                records = self.execute_select(query, params)
+                # Keep `records_per_keylength` records per size, preferring rows past the seed
+                records = []
+                per_size = {}
+                for record in sampled:
+                    if per_size.get(record["size"], 0) < self.records_per_keylength:
+                        per_size[record["size"]] = per_size.get(record["size"], 0) + 1
+                        records.append(record)
 
                 total_records = 0
                 current_size = None
@@ -794,21 +1233,11 @@ class MariaDBConnector:
                         current_size = record["size"]
                         size_count = 0
 
-                    # Format as SSH moduli format
-                    line = " ".join(
-                        (
-                            strip_punction_from_datetime_str(
-                                record["timestamp"]
-                            ),  # timestamp
-                            "2",
-                            "6",
-                            "100",  # type # tests # trials
-                            str(record["size"]),  # size
-                            "2",  # generator
-                            str(record["modulus"]) + "\n",  # Modulus<eol>
-                        )
+                    # Format as SSH moduli format: timestamp type tests trials size generator modulus
+                    lines.append(
+                        f"{strip_punction_from_datetime_str(record['timestamp'])} 2 6 100 "
+                        f"{record['size']} 2 {record['modulus']}\n"
                     )
-                    f.write(line)
                     total_records += 1
                     size_count += 1
 
@@ -818,6 +1247,8 @@ class MariaDBConnector:
                         f"Wrote {size_count} records of size {current_size}"
                     )
 
+                f.write("".join(lines).encode())
+
             self.logger.info(
                 f"Successfully wrote {total_records} moduli records to {output_file}"
             )
@@ -827,22 +1258,28 @@ class MariaDBConnector:
             self.logger.debug(f"Moving {len(records)} records to archive table {archive_table}")
 
             try:
-                with self.get_connection() as connection:
-                    with self.transaction(connection):
-                        for record in records:
-                            # ADD Record to .archived_moduli
-                            archive_query = f"INSERT INTO {archive_table} (timestamp, config_id, size, modulus) VALUES (%s, %s, %s, %s)"
-                            archive_params = (record["timestamp"], self.config_id, record["size"], record["modulus"])
-
-                            with connection.cursor() as cursor:
-                                cursor.execute(archive_query, archive_params)
-
-                            # DELETE Record from .moduli
-                            delete_query = f"DELETE FROM {table} WHERE timestamp = %s AND size = %s AND modulus = %s"
-                            delete_params = (record["timestamp"], record["size"], record["modulus"])
-
+                if records:
+                    # One bulk INSERT and one bulk DELETE instead of two statements per record
+                    archive_query = f"INSERT INTO {archive_table} (timestamp, config_id, size, modulus, modulus_hash) VALUES (%s, %s, %s, %s, %s)"
+                    archive_params = [
+                        (
+                            record["timestamp"], self.config_id, record["size"], record["modulus"],
+                            compute_modulus_hash(record["modulus"]),
+                        )
+                        for record in records
+                    ]
+                    delete_query = f"DELETE FROM {table} WHERE timestamp = %s AND size = %s AND modulus = %s"
+                    delete_params = [
+                        (record["timestamp"], record["size"], record["modulus"]) for record in records
+                    ]
+
+                    with self.get_connection() as connection:
+                        with self.transaction(connection):
                             with connection.cursor() as cursor:
-                                cursor.execute(delete_query, delete_params)
+                                # ADD Records to .archived_moduli
+                                cursor.executemany(archive_query, archive_params)
+                                # DELETE Records from .moduli
+                                cursor.executemany(delete_query, delete_params)
 
                 self.logger.info(f"Successfully archived {len(records)} records from moduli to moduli_archive")
             except Exception as archive_err:
@@ -886,9 +1323,7 @@ class MariaDBConnector:
             results = self.execute_select(query)
 
             # Convert results to dictionary with string keys as specified in the return type
-            stats_dict = {}
-            for row in results:
-                stats_dict[str(row["size"])] = row["count"]
+            stats_dict = {str(row["size"]): row["count"] for row in results}
 
             # Add available moduli files count based on the smallest count divided by records_per_keylength
             if stats_dict:
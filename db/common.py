@@ -17,16 +17,24 @@ that handle edge cases appropriately and provide clear error messages.
 """
 
 import configparser
+import hashlib
 from pathlib import Path
-from re import compile, sub
+from re import compile
 from typing import Any, Callable, Dict, Optional, Union
 
 __all__ = [
+    "compute_modulus_hash",
     "is_valid_identifier_sql",
     "parse_mysql_config",
     "get_mysql_config_value"
 ]
 
+# Unquoted SQL identifier characters
+_IDENT_RE = compile(r"^[a-zA-Z0-9_$]+$")
+
+# Inline `.cnf` comment, with the whitespace before it
+_INLINE_COMMENT_RE = compile(r"\s*#.*$")
+
 
 def is_valid_identifier_sql(identifier: str) -> bool:
     """
@@ -56,10 +64,7 @@ def is_valid_identifier_sql(identifier: str) -> bool:
         return len(identifier) > 2
 
     # For unquoted identifiers, check that they only contain valid characters
-    valid_pattern = compile(r"^[a-zA-Z0-9_$]+$")
-
-    # Validate the pattern
-    if not valid_pattern.match(identifier):
+    if not _IDENT_RE.match(identifier):
         return False
 
     # MariaDB reserved words could be added here to make the validation stricter
@@ -68,6 +73,23 @@ def is_valid_identifier_sql(identifier: str) -> bool:
     return True
 
 
+def compute_modulus_hash(modulus: Union[str, bytes]) -> bytes:
+    """
+    Computes the raw SHA-512 digest stored in the `modulus_hash` column. Hashing on the client
+        keeps SHA-512 out of the server's INSERT path; the digest matches the server-side
+        `UNHEX(SHA2(modulus, 512))` of the same modulus text.
+
+    Args:
+        modulus (Union[str, bytes]): The modulus as written to the `modulus` column.
+
+    Returns:
+        bytes: The 64-byte SHA-512 digest.
+    """
+    if isinstance(modulus, str):
+        modulus = modulus.encode()
+    return hashlib.sha512(modulus).digest()
+
+
 def get_mysql_config_value(
         cnf: Dict[str, Dict[str, str]], section: str, key: str, default: Any = None
 ) -> Any:
@@ -199,7 +221,7 @@ def parse_mysql_config(mysql_cnf: Union[str, Path], file_system: Optional[Dict[s
             for key, value in cnf.items(section_name):
                 if value is not None:
                     # Strip inline comments (everything after # including whitespace before it)
-                    cleaned_value = sub(r"\s*#.*$", "", value).strip()
+                    cleaned_value = _INLINE_COMMENT_RE.sub("", value).strip()
                     result[section_name][key] = cleaned_value
                 else:
                     result[section_name][key] = None
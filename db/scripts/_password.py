@@ -0,0 +1,35 @@
+import secrets
+import string
+
+from config import CONST_MARIADB_PASSWORD_LENGTH
+
+__all__ = ["ALPHABET", "generate_random_password"]
+
+# Letters, digits and MariaDB.com recommended safe special characters, excluding quotes, backslash
+# and `#`, which starts a comment in MariaDB option files
+ALPHABET = (string.ascii_letters + string.digits + "+-*/,.:;!?$%&@=^_~|<>()[]{}").encode()
+
+# Random byte -> alphabet character; bytes at or above the largest multiple of the alphabet size
+# are rejected so every character stays equally likely
+_TABLE = bytes(ALPHABET[b % len(ALPHABET)] for b in range(256))
+_REJECT = bytes(range(256 - 256 % len(ALPHABET), 256))
+
+
+def generate_random_password(length: int = CONST_MARIADB_PASSWORD_LENGTH) -> str:
+    """
+    Generates a random password of the specified length, consisting of letters, digits,
+    and MariaDB-recommended safe special characters. This method uses cryptographically
+    secure random number generation to ensure unpredictability of the password.
+
+    Args:
+        length (int): The desired length of the generated password.
+
+    Returns:
+        str: A randomly generated password containing letters, digits, and safe special characters.
+    """
+    # One token_bytes draw usually suffices; translate maps and filters it in C
+    password = b""
+    while len(password) < length:
+        password += secrets.token_bytes(length * 2).translate(_TABLE, _REJECT)
+
+    return password[:length].decode("ascii")
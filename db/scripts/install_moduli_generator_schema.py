@@ -1,40 +1,75 @@
 #!/usr/bin/env python3
+import logging
+from functools import partial
+from pathlib import Path
+
 from config import default_config
+from config._logging import install_async_logging
 from db import MariaDBConnector
 from db.utils import (
     InstallSchema,
     cnf_argparser as argparser,
-    get_moduli_generator_db_schema_statements,
-    get_moduli_generator_user_schema_statements
+    create_moduli_generator_cnf,
+    generate_random_password,
+    get_moduli_generator_schema_statements
 )
 
+logger = logging.getLogger(__name__)
+
 
 def main():
-    config = default_config()
     args = argparser().parse_args()
+    config = default_config()
+    # Progress goes to the console and, through the background listener, to the log file
+    install_async_logging(config, level=logging.INFO, console=True)
     # Privileged MariaDB Configuration File, DEFAULT `moduli_generator` user DOES NOT HAVE THESE PRIVILEGES
-    config.mariadb_cnf = config.moduli_home / config.privileged_tmp_cnf
-    db = MariaDBConnector(config)
-
-    # Install `Moduli Generator` schema
-    db_install = InstallSchema(db, get_moduli_generator_db_schema_statements, config.db_name)
-    user_install = InstallSchema(db, get_moduli_generator_user_schema_statements, config.db_name)
-
-    if args.batch:
-        db_success = db_install.install_schema_batch()
-        user_success = user_install.install_schema_batch()
-        if not db_success or not user_success:
-            return 1
+    if args.mariadb_privilged_cnf:
+        config.mariadb_cnf = Path(args.mariadb_privilged_cnf)
+    elif args.mariadb_cnf:
+        config.mariadb_cnf = Path(args.mariadb_cnf)
     else:
-        db_success = db_install.install_schema()
-        user_success = user_install.install_schema()
-        if not db_success or not user_success:
-            return 2
+        config.mariadb_cnf = config.moduli_home / config.privileged_tmp_cnf
+    if not config.mariadb_cnf.exists():
+        logger.error("Privileged MariaDB configuration file not found: %s", config.mariadb_cnf)
+        return 4
+    config.pool_size = args.pool_size
+
+    password = generate_random_password()
+
+    # One connector (pool plus cached multi-statement connection) serves the whole install
+    with MariaDBConnector(config) as db:
+        # Install `Moduli Generator` database schema and user in a single pass
+        schema_statements = partial(
+            get_moduli_generator_schema_statements,
+            password=password,
+            max_connections_per_hour=args.max_connections_per_hour,
+            max_updates_per_hour=args.max_updates_per_hour,
+            max_user_connections=args.max_user_connections,
+        )
+        schema_install = InstallSchema(db, schema_statements, config.db_name)
+
+        if args.parallel:
+            success, failure_code = schema_install.install_schema_parallel(), 3
+        elif args.batch:
+            success, failure_code = schema_install.install_schema_batch(), 1
+        else:
+            success, failure_code = schema_install.install_schema(), 2
+        if not success:
+            return failure_code
 
-    print("Database and User schema installed successfully")
+    # Store the `moduli_generator` credentials only once the accounts exist
+    create_moduli_generator_cnf(
+        "moduli_generator",
+        "localhost",
+        port=3306,
+        ssl="false",
+        database=config.db_name,
+        password=password,
+    )
+    logger.info("Database and User schema installed successfully")
     return 0
 
 
 if __name__ == "__main__":
     # install_moduli_generator_cnf
-    exit(main())
+    raise SystemExit(main())
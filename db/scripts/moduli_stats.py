@@ -1,12 +1,34 @@
 import argparse
-from json import dump
-from logging import DEBUG, basicConfig, getLogger
-from pathlib import PosixPath as Path
-from sys import exit
+import json
+import sys
+from logging import getLogger
+from pathlib import Path
 
 from config import ModuliConfig, default_config, iso_utc_timestamp
+from config._logging import install_async_logging
 from db import MariaDBConnector
 
+try:
+    import orjson
+except ImportError:
+    # orjson is optional (`fast-json` extra); the stdlib encoder is used without it
+    orjson = None
+
+# Default directory for status files, resolved once per interpreter
+_HOME = Path.home()
+
+
+def _dumps_status(status: dict, pretty: bool = False) -> bytes:
+    """
+    Serializes `status` to JSON bytes in one call, with orjson when it is installed. The output
+    is compact unless `pretty` is set, in which case it is indented by two spaces.
+    """
+    if orjson is not None:
+        return orjson.dumps(status, option=orjson.OPT_INDENT_2 if pretty else None)
+    if pretty:
+        return json.dumps(status, indent=2).encode()
+    return json.dumps(status, separators=(",", ":")).encode()
+
 
 def main(config: ModuliConfig = default_config(), output_file=None):
     """
@@ -34,39 +56,43 @@ def main(config: ModuliConfig = default_config(), output_file=None):
         type=str,
         help="Path to output file (default: ${HOME}/FRESH_MODULI_<UTC_TIMESTAMP>.ssh2-moduli2)",
     )
+    parser.add_argument(
+        "--pretty",
+        action="store_true",
+        help="Indent the JSON status file for reading (default: compact)",
+    )
     args = parser.parse_args()
 
-    # Configure logging
-    basicConfig(
-        level=DEBUG,
-        format="%(asctime)s - %(levelname)s: %(message)s",
-        filename=config.log_file,
-        filemode="a",
-    )
+    # Configure logging; records are written to the log file by a background listener
+    install_async_logging(config)
     logger = getLogger(__name__)
 
-    db = MariaDBConnector(config)
-    logger.debug(f"MariaDB Connector Initialized: {config}")
-
+    # An explicit `output_file` argument takes precedence over --output-file
+    output_file = output_file if output_file is not None else args.output_file
     if output_file is None:
-        status_file = Path.home() / f"MG_STATUS_{iso_utc_timestamp(compress=True)}.txt"
+        status_file = _HOME / f"MG_STATUS_{iso_utc_timestamp(compress=True)}.txt"
     else:
-        status_file = Path(args.output_file)
+        status_file = Path(output_file)
+    if not status_file.parent.is_dir():
+        logger.error("Output directory does not exist: %s", status_file.parent)
+        return 1
+
+    # Connect only once the arguments and output path are known to be usable
+    db = MariaDBConnector(config)
+    logger.debug("MariaDB Connector Initialized: %s", config)
 
     # Get the records and save to the specified file
     status = db.stats()
-    with status_file.open("w") as of:
-        dump(status, of, indent=4)
-
-    # Print a header and then the installers
-    logger.info(f"Key-Length: #Records")
-    print(f"Key-Length: #Records")
+    if not status:
+        logger.warning("No moduli stats rows, skipping %s", status_file)
+        return 0
+    status_file.write_bytes(_dumps_status(status, args.pretty))
 
-    logger.info(f"Key-Length: #Records")
-    for keysize in status:
-        logger.info(f"{keysize}: {status[keysize]}")
-        print(f"{keysize}: {status[keysize]}")
+    # Print a header and then the counts; the same report goes to the log file as one record
+    report = "Key-Length: #Records\n" + "\n".join(f"{keysize}: {count}" for keysize, count in status.items())
+    logger.info(report)
+    sys.stdout.write(report + "\n")
 
 
 if __name__ == "__main__":
-    exit(main())
+    raise SystemExit(main())
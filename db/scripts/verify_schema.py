@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # Import the default configuration
 from config import ModuliConfig, argparser_moduli_generator, iso_utc_time_notzinfo
+from config._logging import install_async_logging
 from db import MariaDBConnector
 
 
@@ -20,14 +21,17 @@ def main(config: ModuliConfig = None):
     if not config:
         config = argparser_moduli_generator.local_config()
 
-    logger = config.get_logger()
-    logger.name = __name__
-    logger.debug(f"Using default config: {config}")
+    # Records are written to the log file by a background listener
+    install_async_logging(config)
+    logger = config.get_logger().getChild(__name__)
+    logger.debug("Using default config: %s", config)
 
     # Generate, Screen, Store, and Write Moduli File
     start_time = iso_utc_time_notzinfo()
     logger.info(
-        f'Starting Moduli Generation at {start_time.strftime("%Y-%m-%d %H:%M:%S")}, with {config.key_lengths} as moduli key-lengths'
+        "Starting Moduli Generation at %s, with %s as moduli key-lengths",
+        start_time.strftime("%Y-%m-%d %H:%M:%S"),
+        config.key_lengths,
     )
 
     # The Invocation
@@ -36,24 +40,23 @@ def main(config: ModuliConfig = None):
     except RuntimeError as err:
         logger.error(
             "Are you pointing to the correct MariaDB instance and *.cnf?\n"
-            f"Instantiating MariaDBConnector Failed: {err}"
+            "Instantiating MariaDBConnector Failed: %s",
+            err,
         )
         return 1
     except ValueError as err:
-        logger.error(f"ModuliDB Verification Failed: {err}")
+        logger.error("ModuliDB Verification Failed: %s", err)
         return 1
     except Exception as err:
-        logger.error(f"ModuliDB Verification FAILED: {err}")
+        logger.error("ModuliDB Verification FAILED: %s", err)
         return 2
     else:
         # Stats and Cleanup
         end_time = iso_utc_time_notzinfo()
         duration = (end_time - start_time).total_seconds()
-        logger.info(f"MariaDB Schema Validated. Time taken: {int(duration)} seconds")
+        logger.info("MariaDB Schema Validated. Time taken: %d seconds", duration)
         return 0
 
-    logger.info(f"self: {self}: Connector Validated and Instantiated")
-
 
 if __name__ == "__main__":
-    exit(main())
+    raise SystemExit(main())
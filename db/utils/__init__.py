@@ -1,20 +1,33 @@
-import secrets
-import string
-from argparse import ArgumentParser
+import logging
+import mmap
+import os
+import re
+import stat
+import threading
+import time
+from argparse import ArgumentParser, ArgumentTypeError, BooleanOptionalAction
+from collections import deque
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
-from config import default_config
+from config import DEFAULT_MARIADB_CNF, default_config
 from db import MariaDBConnector
-from db.common import (get_mysql_config_value, is_valid_identifier_sql, parse_mysql_config)
+from db.common import (compute_modulus_hash, get_mysql_config_value, is_valid_identifier_sql, parse_mysql_config)
+from db.errors import DatabaseError, QueryError
+from db.scripts._password import generate_random_password
 
 __all__ = [
     "InstallSchema",
+    "Stmt",
     "build_cnf",
     "cnf_argparser",
+    "compute_modulus_hash",
     "create_moduli_generator_cnf",
     "generate_random_password",
     "get_moduli_generator_db_schema_statements",
+    "get_moduli_generator_schema_statements",
     "get_moduli_generator_user_schema_statements",
     "get_mysql_config_value",
     "parse_mysql_config",
@@ -23,6 +36,173 @@ __all__ = [
 ]
 
 
+# Application config directory and client cnf, resolved (and the directory created) once at import
+_CONFIG_DIR = default_config().moduli_home
+_DEFAULT_CNF_PATH = _CONFIG_DIR / DEFAULT_MARIADB_CNF
+
+
+class Stmt(NamedTuple):
+    """A schema statement: SQL text, optional bind parameters and whether to fetch results."""
+    query: str
+    params: Optional[tuple]
+    fetch: bool
+
+
+logger = logging.getLogger(__name__)
+
+# Account and privilege statements; these commit implicitly and run outside the schema transaction
+_PRIVILEGE_RE = re.compile(r"^\s*(CREATE\s+USER|ALTER\s+USER|DROP\s+USER|GRANT|REVOKE|FLUSH)\b", re.IGNORECASE)
+
+# `GRANT <privileges> ON <object> TO ...` lines returned by SHOW GRANTS; role grants have no ON
+_GRANT_RE = re.compile(r"^GRANT\s+(.+?)\s+ON\s+(\S+)\s+TO\s", re.IGNORECASE)
+_COLUMN_LIST_RE = re.compile(r"\s*\([^)]*\)")
+# SHOW GRANTS escapes `_` and `%` in database names, e.g. `moduli\_db`.*
+_GRANT_ESCAPE_RE = re.compile(r"\\(.)")
+
+# Privileges the schema DDL, migrations and seed data need; ALL PRIVILEGES covers them
+_SCHEMA_PRIVILEGES = frozenset({"CREATE", "ALTER", "INDEX", "INSERT", "SELECT", "UPDATE", "CREATE VIEW"})
+
+# Errors for a `;`-joined packet on a server or proxy without multi-statement support: the packet
+# is parsed as one statement (ER_PARSE_ERROR) or its extra results are unexpected (out of sync)
+_MULTI_STATEMENT_UNSUPPORTED_ERRNOS = frozenset({1064, 2014})
+
+# Maximum statements queued ahead of the server in batch mode
+_MAX_IN_FLIGHT = 8
+
+# Statements between progress lines when statements are executed one at a time
+_PROGRESS_INTERVAL = 16
+
+# Dependency levels for parallel schema installation; statements on one level are independent
+_DDL_LEVELS = (
+    (re.compile(r"^\s*CREATE\s+DATABASE\b", re.IGNORECASE), 0),
+    (re.compile(r"^\s*CREATE\s+TABLE\b(?!.*\bREFERENCES\b)", re.IGNORECASE | re.DOTALL), 1),
+    (re.compile(r"^\s*CREATE\s+TABLE\b", re.IGNORECASE), 2),
+    # Seed data needs only `mod_fl_consts`, so it loads alongside the dependent tables
+    (re.compile(r"^\s*INSERT\b", re.IGNORECASE), 2),
+    # Views take shared metadata locks and indexes lock only their own table: one level
+    (re.compile(r"^\s*CREATE\s+(INDEX|VIEW)\b", re.IGNORECASE), 3),
+)
+
+
+def _schema_level(query: str, position: int) -> int:
+    """
+    Returns the dependency level of a schema statement. Statements that do not match a known
+    DDL pattern (users, grants) are placed on their own level after all DDL, in input order.
+    """
+    for pattern, level in _DDL_LEVELS:
+        if pattern.match(query):
+            return level
+    return len(_DDL_LEVELS) + position
+
+
+# One SQL statement: quoted strings and comments are consumed whole, so `;` inside them does not split
+_SQL_STATEMENT_RE = re.compile(
+    rb"""(?:'(?:\\.|[^'\\])*'|"(?:\\.|[^"\\])*"|`[^`]*`|--[^\n]*|#[^\n]*|/\*.*?\*/|[^;'"`#/-]+|-(?!-)|/(?!\*))+""",
+    re.DOTALL,
+)
+# A statement made up only of whitespace and comments
+_SQL_COMMENT_ONLY_RE = re.compile(rb"(?:\s+|--[^\n]*|#[^\n]*|/\*.*?\*/)*", re.DOTALL)
+
+# Stream tokenizer: a run of plain text or a lone operator character, the body of a quoted string
+# (escapes are consumed in pairs, so a match never ends inside one), and the closer of each comment
+_SQL_PLAIN_RE = re.compile(rb"""[^;'"`#/-]+|[-/]""")
+_SQL_QUOTED_BODY_RE = {
+    quote: re.compile(rb"[^%b\\]*(?:\\.[^%b\\]*)*" % (quote, quote), re.DOTALL) for quote in (b"'", b'"')
+}
+_SQL_CLOSERS = {b"`": b"`", b"#": b"\n", b"--": b"\n", b"/*": b"*/"}
+
+# Statements sent per multi-statement script when installing from a schema file
+_SCHEMA_FILE_BATCH_SIZE = 64
+
+# Bytes per multi-statement script from a schema file: the client's default 16 MiB max_allowed_packet,
+# less slack for the packet header and `;` separators
+_SCHEMA_FILE_PACKET_BYTES = 16 * 1024 * 1024 - 64 * 1024
+
+# Bytes read per chunk from schema sources that cannot be mapped (pipes, FIFOs)
+_SCHEMA_FILE_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_sql_statements(schema_content: bytes):
+    """
+    Yields the non-empty SQL statements of `schema_content` (any bytes-like buffer, e.g. an
+    `mmap`) one at a time, decoding each statement lazily. Statements consisting only of
+    comments are skipped.
+
+    Raises:
+        ValueError: If a quoted string or comment is not terminated.
+    """
+    pos, size = 0, len(schema_content)
+    while pos < size:
+        match = _SQL_STATEMENT_RE.match(schema_content, pos)
+        end = match.end() if match else pos
+        # The statement pattern only stops early at a quote or comment that is never closed
+        if end < size and schema_content[end:end + 1] != b";":
+            raise ValueError(f"Unterminated quoted string or comment: {bytes(schema_content[end:end + 40])!r}")
+        statement = schema_content[pos:end]
+        if not _SQL_COMMENT_ONLY_RE.fullmatch(statement):
+            yield statement.strip().decode("utf-8")
+        pos = end + 1
+
+
+def _quoted_end(buffer: bytearray, start: int, resume: int) -> Tuple[Optional[int], int]:
+    """
+    Returns the end of the quoted string or comment opening at `start`, or None if it is not closed
+    yet, together with the offset from which to continue the search once more input arrives.
+    """
+    quote = bytes(buffer[start:start + 1])
+    if quote in _SQL_QUOTED_BODY_RE:
+        end = _SQL_QUOTED_BODY_RE[quote].match(buffer, max(resume, start + 1)).end()
+        if buffer[end:end + 1] == quote:
+            return end + 1, end
+        return None, end
+
+    opener = quote if quote in _SQL_CLOSERS else bytes(buffer[start:start + 2])
+    closer = _SQL_CLOSERS[opener]
+    index = buffer.find(closer, max(resume, start + len(opener)))
+    if index < 0:
+        # A closer split across chunks is found by backing up over its first bytes
+        return None, max(start + len(opener), len(buffer) - len(closer) + 1)
+    return index + len(closer), index
+
+
+def _iter_sql_statements_stream(stream, chunk_size: int = _SCHEMA_FILE_CHUNK_SIZE):
+    """
+    Yields the non-empty SQL statements of a binary `stream` like `_iter_sql_statements`, reading
+    `chunk_size` bytes at a time. Each byte is scanned once: a quote or comment still open at the
+    end of a chunk is resumed where the previous search stopped, so long literals and statements
+    spanning many chunks take linear time. A statement is yielded once its terminating top-level
+    `;` has been read.
+
+    Raises:
+        ValueError: If a quoted string or comment is not terminated when the stream ends.
+    """
+    buffer = bytearray()
+    scan = resume = 0
+    while chunk := stream.read(chunk_size):
+        buffer += chunk
+        while scan < len(buffer):
+            head = bytes(buffer[scan:scan + 2])
+            if head[:1] in _SQL_CLOSERS or head[:1] in _SQL_QUOTED_BODY_RE or head in _SQL_CLOSERS:
+                end, resume = _quoted_end(buffer, scan, resume)
+                if end is None:
+                    break
+            elif head in (b"-", b"/"):
+                # The next chunk tells an operator from the start of a comment
+                break
+            elif head[:1] == b";":
+                statement = buffer[:scan]
+                if not _SQL_COMMENT_ONLY_RE.fullmatch(statement):
+                    yield statement.strip().decode("utf-8")
+                # Dropping a bytearray prefix does not copy the rest of the buffer
+                del buffer[:scan + 1]
+                scan = resume = 0
+                continue
+            else:
+                end = _SQL_PLAIN_RE.match(buffer, scan).end()
+            scan = resume = end
+    yield from _iter_sql_statements(buffer)
+
+
 class InstallSchema(object):
     """
     Manages the installation of database schemas in a MariaDB database.
@@ -34,14 +214,14 @@ class InstallSchema(object):
     Attributes:
         config (Config): The default configuration object for the application.
         db (MariaDBConnector): The database connector instance used to execute schema statements.
-        schema_statements (List[Dict[str, Any]]): List of schema statements to be executed, including
+        schema_statements (Sequence[Stmt]): Schema statements to be executed, including
             SQL queries and optional parameters.
     """
 
     def __init__(
             self,
             db: MariaDBConnector,
-            schema_statements_function: Callable[[str], List[Dict[str, Any]]],
+            schema_statements_function: Callable[[str], Sequence[Stmt]],
             db_name: str = default_config().db_name
     ):
         """
@@ -55,136 +235,369 @@ class InstallSchema(object):
         """
         self.config = default_config()
         self.db = db
+        self.db_name = db_name
         self.schema_statements = schema_statements_function(db_name)
 
-        print(f"Installing schema for database: {db_name}")
+        logger.info(f"Installing schema for database: {db_name}")
 
     def install_schema(self) -> bool:
         """
-        Executes a series of schema installation statements stored in `schema_statements`. Each statement
-                is executed using the provided database connection interface `db_conn`. If the installation is
-                successful, it returns True; otherwise, if an exception occurs, it returns False.
-
-                Schema installation includes iterating over the `schema_statements` and executing the statements
-                with optional parameters and fetching capabilities as defined in the `schema_statements` list.
+        Executes a series of schema installation statements stored in `schema_statements`, one
+                statement at a time on the connector's connection. User and privilege statements,
+                which commit implicitly, run after the table, view, index and data statements. If the
+                installation is successful, it returns True; otherwise the error is logged and it
+                returns False.
 
         Returns:
             bool: Boolean indicating the success or failure of the schema installation process.
-
-        Raises:
-            Exception: If any error occurs during the execution of schema statements.
         """
-        try:
-            for i, statement_info in enumerate(self.schema_statements):
-                query = statement_info["query"]
-                params = statement_info.get("params")
-                fetch = statement_info.get("fetch", False)
+        return self._install(batch=False)
 
-                # Skip empty statements
-                if not query.strip():
-                    continue
+    def _grouped_statements(self) -> Tuple[List[tuple], List[tuple]]:
+        """
+        Splits the non-empty schema statements into `(query, params)` pairs for the schema
+                transaction and for the user and privilege statements, which commit implicitly.
 
-                print(
-                    f"Executing statement {i + 1}/{len(self.schema_statements)}: {query[:50]}..."
-                )
+        Returns:
+            Tuple[List[tuple], List[tuple]]: The transactional and the privileged statements.
+        """
+        transactional, privileged = [], []
+        for i, (query, params, _) in enumerate(self.schema_statements):
+            # Skip empty statements
+            query = query.strip()
+            if not query:
+                continue
 
-                # Execute the statement with parameters
-                self.db.sql(query, params, fetch)
+            logger.debug("Executing statement %d/%d: %.50s...", i + 1, len(self.schema_statements), query)
 
-            print("Schema installation completed successfully")
-            return True
-
-        except Exception as e:
-            print(f"Error installing schema: {e}")
-            return False
+            group = privileged if _PRIVILEGE_RE.match(query) else transactional
+            group.append((query, params))
+        return transactional, privileged
 
     def install_schema_batch(self) -> bool:
         """
         Installs schema statements in batch mode using a database connection.
-                The method executes all provided schema statements within a single transaction
-                to ensure atomicity. Each statement may include associated parameters.
+                The statements are sent through `execute_script` on a single multi-statement
+                connection, so runs of parameterless statements travel as one `;`-joined packet.
+                User and privilege statements run afterwards as their own packet, with their
+                parameters interpolated client-side. If the server rejects multi-statement
+                execution, the statements are re-run one at a time (they are idempotent), as in
+                `install_schema`.
 
                 If the execution is successful, a success message is logged, and the method
-                returns True. Otherwise, a failure message is logged, and the method returns False.
-                In the case of an error, an exception message is printed, and the method also
-                returns False.
+                returns True. Otherwise, an error message is logged, and the method returns False.
 
         Returns:
             bool: A boolean indicating whether the schema installation succeeded in batch mode.
         """
-        try:
-            # Separate queries and parameters
-            queries = []
-            params_list = []
+        return self._install(batch=True)
 
-            for statement_info in self.schema_statements:
-                query = statement_info["query"]
-                params = statement_info.get("params")
-
-                if query.strip():
-                    queries.append(query)
-                    params_list.append(params)
+    def _install(self, batch: bool) -> bool:
+        """
+        Checks privileges, migrates legacy tables and executes the schema statements, either as
+                multi-statement scripts (`batch`) or one at a time.
 
-            # Execute all statements in a single transaction
-            success = self.db.execute_batch(queries, params_list)
+        Args:
+            batch (bool): Send the statements through `execute_script`, falling back to one at a
+                time if the server rejects multi-statement execution.
 
-            if success:
-                print("Schema installation completed successfully (batch mode)")
-                return True
-            else:
-                print("Schema installation failed")
+        Returns:
+            bool: True if the schema was installed, False if an error was logged.
+        """
+        mode = " (batch mode)" if batch else ""
+        try:
+            if not self._check_privileges():
                 return False
+            self._migrate_legacy_tables()
+
+            started = time.perf_counter()
+            transactional, privileged = self._grouped_statements()
+            statements = transactional + privileged
+            if batch:
+                try:
+                    if transactional:
+                        self.db.execute_script(transactional)
+                    # The few account statements are folded into a single multi-statement packet
+                    if privileged:
+                        self.db.execute_script(privileged, inline_params=True)
+                except QueryError as err:
+                    if getattr(err.__cause__, "errno", None) not in _MULTI_STATEMENT_UNSUPPORTED_ERRNOS:
+                        raise
+                    logger.warning(
+                        f"Multi-statement execution is not supported ({err}); falling back to per-statement execution"
+                    )
+                    self._submit_statements(statements)
+            else:
+                self._submit_statements(statements)
+
+            logger.info(f"Executed {len(statements)} statements in {time.perf_counter() - started:.2f}s")
+            logger.info(f"Schema installation completed successfully{mode}")
+            return True
 
         except Exception as e:
-            print(f"Error installing schema in batch mode: {e}")
+            logger.error(f"Error installing schema{mode}: {e}")
             return False
 
-    def install_schema_file(self, schema_file: Path = None) -> bool:
+    def _check_privileges(self) -> bool:
         """
-        Install a database schema from a specified SQL file. The method reads the schema
-                file, splits the content into individual SQL statements, and executes them.
+        Checks, with a single `SHOW GRANTS` round-trip, that the current user holds the privileges
+                the install needs on the target database, so a missing grant aborts the install
+                before any statement is sent. Privileges inherited through roles cannot be resolved
+                from `SHOW GRANTS` alone, so when roles are granted, or no line grants anything on
+                the target database, the result is inconclusive: a warning is logged and the install
+                proceeds, leaving the server to reject what the user cannot do.
+
+        Returns:
+            bool: True if the install can proceed, False if required privileges are missing.
+        """
+        needed = set(_SCHEMA_PRIVILEGES)
+        if any(_PRIVILEGE_RE.match(query) for query, _, _ in self.schema_statements):
+            needed.add("CREATE USER")
+
+        scopes = {"*.*", f"`{self.db_name}`.*", f"{self.db_name}.*"}
+        granted = set()
+        has_roles = False
+        for row in self.db.sql("SHOW GRANTS FOR CURRENT_USER()", None, True) or ():
+            line = next(iter(row.values()))
+            match = _GRANT_RE.match(line)
+            if match is None:
+                has_roles = has_roles or line.upper().startswith("GRANT")
+                continue
+            privileges, scope = match.groups()
+            if _GRANT_ESCAPE_RE.sub(r"\1", scope) not in scopes:
+                continue
+            for privilege in _COLUMN_LIST_RE.sub("", privileges).upper().split(","):
+                granted.add(" ".join(privilege.split()))
+
+        if "ALL PRIVILEGES" in granted:
+            return True
+        missing = needed - granted
+        if not missing:
+            return True
+        if has_roles or not granted:
+            logger.warning(
+                f"Cannot confirm privileges on {self.db_name} from SHOW GRANTS, continuing without: "
+                f"{', '.join(sorted(missing))}"
+            )
+            return True
+        logger.error(f"Missing privileges on {self.db_name} for schema installation: {', '.join(sorted(missing))}")
+        return False
+
+    def _migrate_legacy_tables(self) -> None:
+        """
+        Migrates `moduli` and `moduli_archive` tables created before `modulus_hash` was computed by
+                the client, ahead of the schema statements, whose `CREATE TABLE IF NOT EXISTS` leaves
+                existing tables as they are. One `information_schema` query finds the tables whose hash
+                is still a generated hex string and only those are rebuilt, so an up-to-date schema
+                costs a single round-trip.
+        """
+        rows = self.db.sql(_LEGACY_HASH_QUERY, (self.db_name,), True) or ()
+        legacy = {next(iter(row.values())) for row in rows}
+        statements = [
+            (query.format(db=self.db_name), None)
+            for table, queries in _LEGACY_TABLE_MIGRATIONS.items()
+            if table in legacy
+            for query in queries
+        ]
+        if statements:
+            logger.info(f"Migrating legacy tables in {self.db_name}: {', '.join(sorted(legacy))}")
+            self.db.execute_script(statements)
+
+    def _submit_statements(self, statements: List[tuple]) -> None:
+        """
+        Executes `(query, params)` pairs one at a time on a single-worker executor, so the next
+                statement is prepared while the previous one is on the wire. At most `_MAX_IN_FLIGHT`
+                statements are queued; the oldest is awaited whenever the queue is full. Statements
+                queued behind a failure are skipped and the failure is raised.
+        """
+        failed = threading.Event()
+
+        def submit_statement(query, params):
+            # Statements queued behind a failure are skipped rather than sent
+            if failed.is_set():
+                return
+            try:
+                self.db.sql(query, params, False)
+            except Exception:
+                failed.set()
+                raise
+
+        completed = 0
+
+        def await_oldest():
+            nonlocal completed
+            in_flight.popleft().result()
+            completed += 1
+            if completed % _PROGRESS_INTERVAL == 0:
+                logger.info(f"Executed {completed}/{len(statements)} statements")
+
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            try:
+                for query, params in statements:
+                    if len(in_flight) == _MAX_IN_FLIGHT:
+                        await_oldest()
+                    in_flight.append(executor.submit(submit_statement, query, params))
+
+                while in_flight:
+                    await_oldest()
+            except Exception:
+                for future in in_flight:
+                    future.cancel()
+                raise
+
+    def install_schema_parallel(self, max_workers: int = 4) -> bool:
+        """
+        Installs schema statements level by level, running independent statements concurrently.
+                Statements are grouped into a dependency DAG (database -> `mod_fl_consts` -> tables
+                referencing it and seed data -> indexes and views). Each level is submitted to a thread
+                pool backed by a cloned connector, and the next level starts only once every
+                statement of the current level has completed. User and privilege statements run
+                last as one packet, with their parameters interpolated client-side, as in
+                `install_schema_batch`. If no level holds more than one statement there is nothing
+                to overlap, and the install falls back to the single-connection `install_schema_batch`.
 
         Args:
-            schema_file (Path): Path to the SQL schema file. If not provided, the default
-                   schema file from the data.schema.ssh_moduli_schema.sql package resource is used.
+            max_workers (int): Maximum number of concurrent statements and pooled connections,
+                capped at the size of the widest level. Defaults to 4.
 
         Returns:
             bool: True if the schema installation completes successfully, False otherwise.
         """
+        levels = self._schema_levels()
+        widest = max(map(len, levels), default=0)
+        if widest <= 1:
+            logger.info("No independent schema statements; installing serially")
+            return self.install_schema_batch()
+
+        # No level can use more connections than it has statements
+        workers = min(max_workers, widest)
         try:
-            # If no schema file is provided, return False
-            if schema_file is None:
-                print("No schema file provided")
+            if not self._check_privileges():
                 return False
+            self._migrate_legacy_tables()
+
+            with self.db.clone(pool_size=workers) as worker_db:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for level_statements in levels:
+                        futures = [
+                            executor.submit(worker_db.sql, *statement)
+                            for statement in level_statements
+                        ]
+                        done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                        for future in done:
+                            future.result()
+
+            privileged = [
+                (query.strip(), params)
+                for query, params, _ in self.schema_statements
+                if _PRIVILEGE_RE.match(query)
+            ]
+            if privileged:
+                self.db.execute_script(privileged, inline_params=True)
 
-            # Check if the provided schema file exists
-            if not schema_file.exists():
-                print(f"Schema file not found: {schema_file}")
-                return False
+            logger.info("Schema installation completed successfully (parallel mode)")
+            return True
 
-            # Read the SQL schema file
-            with open(schema_file, "r") as sql_f:
-                schema_content = sql_f.read()
+        except Exception as e:
+            logger.error(f"Error installing schema in parallel mode: {e}")
+            return False
 
-            # Split into statements and execute
-            sql_statements = [
-                stmt.strip() for stmt in schema_content.split(";") if stmt.strip()
-            ]
+    def _schema_levels(self) -> List[List[Stmt]]:
+        """
+        Groups the non-empty schema statements into dependency levels, in execution order. User
+        and privilege statements are left out; they run after the levels as one packet.
+        """
+        levels = {}
+        for i, statement in enumerate(self.schema_statements):
+            query = statement.query.strip()
+            if query and not _PRIVILEGE_RE.match(query):
+                levels.setdefault(_schema_level(query, i), []).append(statement._replace(query=query))
+        return [levels[level] for level in sorted(levels)]
+
+    def install_schema_file(self, schema_file: Path = None) -> bool:
+        """
+        Install a database schema from a specified SQL file. The method maps the schema
+                file (or reads pipes and FIFOs in chunks), splits the content into individual SQL
+                statements on top-level `;` only, and sends them as multi-statement scripts of up
+                to `_SCHEMA_FILE_BATCH_SIZE` statements and `_SCHEMA_FILE_PACKET_BYTES` bytes, so only
+                one batch is held in memory. `DELIMITER` blocks are not supported. Legacy tables of
+                `db_name` are migrated first, as in the other install modes.
 
-            for statement in sql_statements:
-                if statement.startswith("#") or not statement.strip():
-                    continue
+        Args:
+            schema_file (Path): Path to the SQL schema file. If not provided, the default
+                   schema file from the data.schema.ssh_moduli_schema.sql package resource is used.
+
+        Returns:
+            bool: True if the schema installation completes successfully, False otherwise.
+        """
+        # If no schema file is provided, return False
+        if schema_file is None:
+            logger.error("No schema file provided")
+            return False
 
-                print(f"Executing SQL statement: {statement[:50]}...")
-                self.db.sql(statement, fetch=False)
+        # Check if the provided schema file exists
+        if not schema_file.exists():
+            logger.error(f"Schema file not found: {schema_file}")
+            return False
 
-            print("Schema installation from file completed successfully")
+        try:
+            self._migrate_legacy_tables()
+            with open(schema_file, "rb") as sql_f:
+                file_stat = os.fstat(sql_f.fileno())
+                if not stat.S_ISREG(file_stat.st_mode):
+                    # Pipes and FIFOs cannot be mapped; read them in chunks instead
+                    self._execute_in_batches(_iter_sql_statements_stream(sql_f))
+                elif file_stat.st_size:
+                    # Map the SQL schema file; pages are read on demand rather than copied into a string
+                    with mmap.mmap(sql_f.fileno(), 0, access=mmap.ACCESS_READ) as schema_content:
+                        self._execute_in_batches(_iter_sql_statements(schema_content))
+
+            logger.info("Schema installation from file completed successfully")
             return True
 
-        except Exception as err:
-            print(f"Error installing schema from file: {err}")
+        # Statement failures surface as QueryError; OSError and ValueError come from reading,
+        # mapping or decoding the file
+        except (DatabaseError, OSError, ValueError) as err:
+            logger.error(f"Error installing schema from file: {err}")
             return False
 
+    def _execute_in_batches(self, statements) -> None:
+        """
+        Sends parameterless statements from an iterable as multi-statement scripts of up to
+                `_SCHEMA_FILE_BATCH_SIZE` statements and `_SCHEMA_FILE_PACKET_BYTES` bytes each.
+                A single statement larger than the byte budget is sent on its own.
+        """
+        batch, batch_bytes = [], 0
+        for statement in statements:
+            logger.debug("Queueing SQL statement: %.50s...", statement)
+            # Statement plus its `;\n` separator
+            size = len(statement.encode("utf-8")) + 2
+            if batch and batch_bytes + size > _SCHEMA_FILE_PACKET_BYTES:
+                self.db.execute_script(batch)
+                batch, batch_bytes = [], 0
+            batch.append((statement, None))
+            batch_bytes += size
+            if len(batch) == _SCHEMA_FILE_BATCH_SIZE:
+                self.db.execute_script(batch)
+                batch, batch_bytes = [], 0
+        if batch:
+            self.db.execute_script(batch)
+
+
+# Largest pool MariaDB Connector/Python accepts
+_MAX_POOL_SIZE = 64
+
+
+def _pool_size(value: str) -> int:
+    """
+    Parses `--pool-size`, rejecting sizes the connection pool cannot be created with.
+    """
+    size = int(value)
+    if not 1 <= size <= _MAX_POOL_SIZE:
+        raise ArgumentTypeError(f"pool size must be between 1 and {_MAX_POOL_SIZE}, got {size}")
+    return size
+
 
 def cnf_argparser() -> ArgumentParser:
     config = default_config()
@@ -244,87 +657,286 @@ def cnf_argparser() -> ArgumentParser:
 
     args.add_argument(
         "--batch",
+        action=BooleanOptionalAction,
+        default=True,
+        help="Send the schema as one multi-statement script (default); --no-batch sends one statement at a time",
+    )
+    args.add_argument(
+        "--parallel",
         action="store_true",
-        help="Use batch execution mode for better performance",
+        help="Install independent schema statements concurrently",
+    )
+    args.add_argument(
+        "--pool-size",
+        type=_pool_size,
+        default=config.pool_size,
+        help="Connections in the MariaDB connection pool (1-64)",
+    )
+    args.add_argument(
+        "--max-connections-per-hour",
+        type=int,
+        default=0,
+        help="MAX_CONNECTIONS_PER_HOUR for the 'moduli_generator' user (0 = unlimited)",
+    )
+    args.add_argument(
+        "--max-updates-per-hour",
+        type=int,
+        default=0,
+        help="MAX_UPDATES_PER_HOUR for the 'moduli_generator' user (0 = unlimited)",
+    )
+    args.add_argument(
+        "--max-user-connections",
+        type=int,
+        default=0,
+        help="MAX_USER_CONNECTIONS for the 'moduli_generator' user (0 = server default)",
     )
     args.add_argument(
         "--output-cnf",
         type=str,
-        default=str(config.moduli_home / "moduli_generator.cnf"),
+        default=str(_DEFAULT_CNF_PATH),
         help="Path to output configuration file"
     )
 
     return args
 
 
-def get_moduli_generator_user_schema_statements(database) -> List[Dict[str, Any]]:
+# User DDL templates; `{database}` and the resource limits are formatted in and `params` names
+# the values bound at call time. Both hosts are handled in one statement each; CREATE USER, ALTER
+# USER and GRANT reload the grant tables themselves, so no FLUSH PRIVILEGES is needed
+_USER_STATEMENTS = (
+    Stmt(
+        query="CREATE USER IF NOT EXISTS "
+              "'moduli_generator'@'%' IDENTIFIED BY %s, "
+              "'moduli_generator'@'localhost' IDENTIFIED BY %s",
+        params=("password", "password"),
+        fetch=False,
+    ),
+    # CREATE USER IF NOT EXISTS leaves existing accounts untouched; re-set the password so
+    # it matches the freshly written cnf on re-installs
+    Stmt(
+        query="ALTER USER "
+              "'moduli_generator'@'%' IDENTIFIED BY %s, "
+              "'moduli_generator'@'localhost' IDENTIFIED BY %s "
+              "WITH MAX_CONNECTIONS_PER_HOUR {max_connections_per_hour} "
+              "MAX_UPDATES_PER_HOUR {max_updates_per_hour} "
+              "MAX_USER_CONNECTIONS {max_user_connections}",
+        params=("password", "password"),
+        fetch=False,
+    ),
+    Stmt(
+        query="GRANT ALL PRIVILEGES ON {database}.* "
+              "TO 'moduli_generator'@'%', 'moduli_generator'@'localhost'",
+        params=None,
+        fetch=False,
+    ),
+)
+
+
+def get_moduli_generator_user_schema_statements(
+        database,
+        password: str,
+        max_connections_per_hour: int = 0,
+        max_updates_per_hour: int = 0,
+        max_user_connections: int = 0,
+) -> List[Stmt]:
     """
-    Generates a series of SQL statements required to create a database user, assign relevant
-    privileges, and manage connections and updates for the `moduli_generator` user. This
-    method ensures that both remote and localhost access configurations for the user are
-    created, and privileges are applied effectively.
+    Generates the SQL statements required to create the `moduli_generator` user and assign
+    its privileges. Remote and localhost accounts are created by a single `CREATE USER`, have
+    their password and resource limits set by a single `ALTER USER` (so re-installs rotate the
+    password of an existing account) and are granted by a single `GRANT`. The password is always
+    passed as a statement parameter and escaped by the connector, never formatted into the query.
+    No files are written; callers store the password with `create_moduli_generator_cnf` once the
+    statements have run.
 
     Args:
         database (str): The name of the database for which the user privileges need to
             be set.
+        password (str): Password for the accounts; the caller keeps it for the cnf file.
+        max_connections_per_hour (int): Connections allowed per hour; 0 means unlimited.
+        max_updates_per_hour (int): Updates allowed per hour; 0 means unlimited.
+        max_user_connections (int): Simultaneous connections allowed; 0 defers to the server's
+            global `max_user_connections`.
 
     Returns:
-        List[Dict[str, Any]]: A list of dictionaries where each dictionary contains an
-            SQL query string (`query`), its corresponding parameters (`params`), and a
-            `fetch` flag indicating whether the operation requires fetching data.
+        List[Stmt]: A list of statements, each holding an SQL query string (`query`), its
+            corresponding parameters (`params`), and a `fetch` flag indicating whether the
+            operation requires fetching data.
     """
-    config = default_config()
-    password = generate_random_password()
-
-    # Create `moduli_generator.cnf` MariaDB CNF File
-    create_moduli_generator_cnf(
-        'moduli_generator',
-        'localhost',
-        **{
-            "port": 3306,
-            "ssl": "false",
-            "database": config.db_name,
-            "password": password
-        })
-
-    # SQL statements to create user, grant privileges, and flush privileges
+    values = {"password": password}
+    # Limits are always written out, so a re-install also resets limits set by an earlier one
+    limits = {
+        "max_connections_per_hour": int(max_connections_per_hour),
+        "max_updates_per_hour": int(max_updates_per_hour),
+        "max_user_connections": int(max_user_connections),
+    }
     return [
-        {
-            "query": "CREATE USER IF NOT EXISTS 'moduli_generator'@'%' IDENTIFIED BY %s "
-                     "WITH MAX_CONNECTIONS_PER_HOUR 100 MAX_UPDATES_PER_HOUR 200 MAX_USER_CONNECTIONS 50",
-            "params": (password,),
-            "fetch": False,
-        },
-        {
-            "query": f"GRANT ALL PRIVILEGES ON {database}.* TO 'moduli_generator'@'%'",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": "FLUSH PRIVILEGES",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": "CREATE USER IF NOT EXISTS 'moduli_generator'@'localhost' IDENTIFIED BY %s "
-                     "WITH MAX_CONNECTIONS_PER_HOUR 100 MAX_UPDATES_PER_HOUR 200 MAX_USER_CONNECTIONS 50",
-            "params": (password,),
-            "fetch": False,
-        },
-        {
-            "query": f"GRANT ALL PRIVILEGES ON {database}.* TO 'moduli_generator'@'localhost'",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": "FLUSH PRIVILEGES",
-            "params": None,
-            "fetch": False,
-        }
+        statement._replace(
+            query=statement.query.format(database=database, **limits),
+            params=tuple(values[name] for name in statement.params) if statement.params else None,
+        )
+        for statement in _USER_STATEMENTS
     ]
 
 
-def get_moduli_generator_db_schema_statements(moduli_db: str = "test_moduli_db") -> List[Dict[str, Any]]:
+# Characters allowed in a database name besides alphanumerics, removed before `isalnum()`
+_IDENT_TT = str.maketrans("", "", "_-")
+
+# Schema DDL templates; `{db}` is replaced with the validated database name
+# `moduli` and `moduli_archive` tables created before `modulus_hash` was computed by the client, when it
+# was a generated hex string
+_LEGACY_HASH_QUERY = """SELECT TABLE_NAME FROM information_schema.COLUMNS
+    WHERE TABLE_SCHEMA = %s AND TABLE_NAME IN ('moduli', 'moduli_archive') AND COLUMN_NAME = 'modulus_hash'
+        AND (GENERATION_EXPRESSION IS NOT NULL OR DATA_TYPE IN ('char', 'varchar'))"""
+
+# Per legacy table: the hash becomes a plain column, wide enough for the hex values while they are
+# rewritten as the raw digest, then narrowed; legacy `moduli` rows also get a random sample key
+_LEGACY_TABLE_MIGRATIONS = {
+    "moduli": (
+        """ALTER TABLE {db}.moduli
+            ADD COLUMN IF NOT EXISTS sample_id BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'Random key for indexed sampling',
+            MODIFY modulus_hash VARBINARY(128) NOT NULL""",
+        "UPDATE {db}.moduli SET modulus_hash = UNHEX(SHA2(modulus, 512)) WHERE LENGTH(modulus_hash) <> 64",
+        "UPDATE {db}.moduli SET sample_id = FLOOR(RAND() * POW(2, 63)) WHERE sample_id = 0",
+        "ALTER TABLE {db}.moduli "
+        "MODIFY modulus_hash BINARY(64) NOT NULL COMMENT 'SHA-512 of modulus, computed by the client'",
+    ),
+    "moduli_archive": (
+        "ALTER TABLE {db}.moduli_archive MODIFY modulus_hash VARBINARY(128) NOT NULL",
+        "UPDATE {db}.moduli_archive SET modulus_hash = UNHEX(SHA2(modulus, 512)) WHERE LENGTH(modulus_hash) <> 64",
+        "ALTER TABLE {db}.moduli_archive "
+        "MODIFY modulus_hash BINARY(64) NOT NULL COMMENT 'SHA-512 of modulus, computed by the client'",
+    ),
+}
+
+_BASE_STATEMENTS = (
+    Stmt(
+        query="CREATE DATABASE IF NOT EXISTS {db}",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="""
+        CREATE TABLE IF NOT EXISTS {db}.mod_fl_consts
+        (
+            config_id TINYINT UNSIGNED PRIMARY KEY,
+            type ENUM('2', '5') NOT NULL COMMENT 'Generator type (2 or 5)',
+            tests VARCHAR(50) NOT NULL COMMENT 'Tests performed on the modulus',
+            trials INT UNSIGNED NOT NULL COMMENT 'Number of trials performed',
+            generator BIGINT UNSIGNED NOT NULL COMMENT 'Generator value',
+            description VARCHAR(255) COMMENT 'Moduli Generator (R) OpenSSH2 moduli properties'
+        )""",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="""INSERT INTO {db}.mod_fl_consts (config_id, type, tests, trials, generator, description)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE description = VALUES(description)""",
+        params=(
+            1,
+            "2",
+            "6",
+            100,
+            2,
+            "Moduli Generator (R) SSH moduli properties",
+        ),
+        fetch=False,
+    ),
+    Stmt(
+        query="""CREATE TABLE IF NOT EXISTS {db}.moduli (
+            id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+            timestamp DATETIME NOT NULL,
+            config_id TINYINT UNSIGNED NOT NULL COMMENT 'Foreign key to moduli constants',
+            size INT UNSIGNED NOT NULL COMMENT 'Key size in bits',
+            modulus TEXT NOT NULL COMMENT 'Prime modulus value',
+            modulus_hash BINARY(64) NOT NULL COMMENT 'SHA-512 of modulus, computed by the client',
+            sample_id BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'Random key for indexed sampling',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (config_id) REFERENCES mod_fl_consts(config_id),
+            UNIQUE KEY (modulus_hash)
+        )""",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="""CREATE VIEW IF NOT EXISTS {db}.moduli_view AS
+        SELECT
+            m.timestamp,
+            c.type,
+            c.tests,
+            c.trials,
+            m.size,
+            c.generator,
+            m.modulus
+        FROM
+            {db}.moduli m
+                JOIN
+            {db}.mod_fl_consts c ON m.config_id = c.config_id""",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="CREATE INDEX IF NOT EXISTS idx_size ON {db}.moduli(size)",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="CREATE INDEX IF NOT EXISTS idx_timestamp ON {db}.moduli(timestamp)",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="CREATE INDEX IF NOT EXISTS idx_size_sample ON {db}.moduli(size, sample_id)",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="""CREATE TABLE IF NOT EXISTS {db}.moduli_archive
+                    (
+                        id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+                        timestamp DATETIME NOT NULL,
+                        config_id TINYINT UNSIGNED NOT NULL COMMENT 'Foreign key to moduli constants',
+                        size INT UNSIGNED NOT NULL COMMENT 'Key size in bits',
+                        modulus TEXT NOT NULL COMMENT 'Prime modulus value',
+                        modulus_hash BINARY(64) NOT NULL COMMENT 'SHA-512 of modulus, computed by the client',
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        FOREIGN KEY (config_id) REFERENCES mod_fl_consts(config_id),
+                        UNIQUE KEY (modulus_hash)
+                   )""",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="""CREATE VIEW IF NOT EXISTS {db}.moduli_archive_view AS
+    SELECT
+        m.timestamp,
+        c.type,
+        c.tests,
+        c.trials,
+        m.size,
+        c.generator,
+        m.modulus
+    FROM
+        {db}.moduli_archive m
+            JOIN
+        {db}.mod_fl_consts c ON m.config_id = c.config_id""",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="CREATE INDEX IF NOT EXISTS idx_size ON {db}.moduli_archive(size)",
+        params=None,
+        fetch=False,
+    ),
+    Stmt(
+        query="CREATE INDEX IF NOT EXISTS idx_timestamp ON {db}.moduli_archive(timestamp)",
+        params=None,
+        fetch=False,
+    )
+)
+
+
+def get_moduli_generator_db_schema_statements(moduli_db: str = "test_moduli_db") -> Tuple[Stmt, ...]:
     """
     Generates MySQL schema creation and configuration statements for a moduli generator database.
 
@@ -337,137 +949,57 @@ def get_moduli_generator_db_schema_statements(moduli_db: str = "test_moduli_db")
             "test_moduli_db".
 
     Returns:
-        List[Dict[str, Any]]: A list of dictionaries containing SQL queries, optional parameters,
-        and fetch flags for creating and configuring the database schema.
+        Tuple[Stmt, ...]: An immutable tuple of statements containing SQL queries, optional parameters,
+        and fetch flags for creating and configuring the database schema. The result is cached per
+        database name and shared between callers.
 
     Raises:
         ValueError: If the provided `moduli_db` name contains invalid characters.
     """
     # Note: Database/table names cannot be parameterized in MySQL/MariaDB,
     # so we still need to validate and use f-strings for identifiers
-    if not moduli_db.replace("_", "").replace("-", "").isalnum():
-        raise ValueError(f"Invalid database name: moduli_db")
+    if not _is_valid_db_name(moduli_db):
+        raise ValueError(f"Invalid database name: {moduli_db}")
+
+    return _db_schema_statements(moduli_db)
 
-    return [
-        {
-            "query": "CREATE DATABASE IF NOT EXISTS moduli_db",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": f"""
-            CREATE TABLE moduli_db.mod_fl_consts 
-            (
-                config_id TINYINT UNSIGNED PRIMARY KEY,
-                type ENUM('2', '5') NOT NULL COMMENT 'Generator type (2 or 5)',
-                tests VARCHAR(50) NOT NULL COMMENT 'Tests performed on the modulus',
-                trials INT UNSIGNED NOT NULL COMMENT 'Number of trials performed',
-                generator BIGINT UNSIGNED NOT NULL COMMENT 'Generator value',
-                description VARCHAR(255) COMMENT 'Moduli Generator (R) OpenSSH2 moduli properties'
-            )""",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": f"""INSERT INTO moduli_db.mod_fl_consts (config_id, type, tests, trials, generator, description)
-                VALUES (%s, %s, %s, %s, %s, %s) \
-                """,
-            "params": (
-                1,
-                "2",
-                "6",
-                100,
-                2,
-                "Moduli Generator (R) SSH moduli properties",
-            ),
-            "fetch": False,
-        },
-        {
-            "query": f"""CREATE TABLE IF NOT EXISTS moduli_db.moduli (
-                id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
-                timestamp DATETIME NOT NULL,
-                config_id TINYINT UNSIGNED NOT NULL COMMENT 'Foreign key to moduli constants',
-                size INT UNSIGNED NOT NULL COMMENT 'Key size in bits',
-                modulus TEXT NOT NULL COMMENT 'Prime modulus value',
-                modulus_hash VARCHAR(128) GENERATED ALWAYS AS (SHA2(modulus, 512)) STORED COMMENT 'Hash of modulus',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (config_id) REFERENCES mod_fl_consts(config_id),
-                UNIQUE KEY (modulus_hash)
-            )""",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": f"""CREATE VIEW IF NOT EXISTS moduli_db.moduli_view AS
-            SELECT
-                m.timestamp,
-                c.type,
-                c.tests,
-                c.trials,
-                m.size,
-                c.generator,
-                m.modulus
-            FROM
-                moduli_db.moduli m
-                    JOIN
-                moduli_db.mod_fl_consts c ON m.config_id = c.config_id""",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": f"CREATE INDEX idx_size ON moduli_db.moduli(size)",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": f"CREATE INDEX idx_timestamp ON moduli_db.moduli(timestamp)",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": f"""CREATE TABLE IF NOT EXISTS moduli_db.moduli_archive
-                        (
-                            id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
-                            timestamp DATETIME NOT NULL,
-                            config_id TINYINT UNSIGNED NOT NULL COMMENT 'Foreign key to moduli constants',
-                            size INT UNSIGNED NOT NULL COMMENT 'Key size in bits',
-                            modulus TEXT NOT NULL COMMENT 'Prime modulus value',
-                            modulus_hash VARCHAR(128) GENERATED ALWAYS AS (SHA2(modulus, 512)) STORED COMMENT 'Hash of modulus',
-                            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                            FOREIGN KEY (config_id) REFERENCES mod_fl_consts(config_id),
-                            UNIQUE KEY (modulus_hash)
-                       )""",
-            "params": None,
-            "fetch": False
-        },
-        {
-            "query": f"""CREATE VIEW IF NOT EXISTS moduli_db.moduli_archive_view AS
-        SELECT
-            m.timestamp,
-            c.type,
-            c.tests,
-            c.trials,
-            m.size,
-            c.generator,
-            m.modulus
-        FROM
-            moduli_db.moduli_archive m
-                JOIN
-            moduli_db.mod_fl_consts c ON m.config_id = c.config_id""",
-            "params": None,
-            "fetch": False,
-        },
-        {
-            "query": f"CREATE INDEX idx_size ON moduli_db.moduli_archive(size)",
-            "params": None,
-            "fetch": False
-        },
-        {
-            "query": f"CREATE INDEX idx_timestamp ON moduli_db.moduli_archive(timestamp)",
-            "params": None,
-            "fetch": False
-        }
-    ]
+
+@lru_cache(maxsize=32)
+def _is_valid_db_name(moduli_db: str) -> bool:
+    """Returns True if `moduli_db` is alphanumeric apart from `_` and `-`, memoized per name."""
+    return moduli_db.translate(_IDENT_TT).isalnum()
+
+
+@lru_cache(maxsize=32)
+def _db_schema_statements(moduli_db: str) -> Tuple[Stmt, ...]:
+    """Renders `_BASE_STATEMENTS` for a validated database name, memoized per name."""
+    return tuple(
+        statement._replace(query=statement.query.format(db=moduli_db))
+        for statement in _BASE_STATEMENTS
+    )
+
+
+def get_moduli_generator_schema_statements(database: str, **user_options) -> Tuple[Stmt, ...]:
+    """
+    Combines the database schema statements and the `moduli_generator` user statements into a
+    single list, so the complete install runs through one `InstallSchema` in one pass. The user
+    statements come last; they need the database to exist but none of its tables.
+
+    Args:
+        database (str): Name of the moduli database.
+        **user_options: Password and resource limits passed to
+            `get_moduli_generator_user_schema_statements`.
+
+    Returns:
+        Tuple[Stmt, ...]: The database statements followed by the user statements.
+
+    Raises:
+        ValueError: If the provided `database` name contains invalid characters.
+    """
+    return (
+        *get_moduli_generator_db_schema_statements(database),
+        *get_moduli_generator_user_schema_statements(database, **user_options),
+    )
 
 
 def update_mariadb_app_owner(host, database, username, password) -> Path:
@@ -489,12 +1021,8 @@ def update_mariadb_app_owner(host, database, username, password) -> Path:
     Returns:
         Path: The path to the generated configuration file.
     """
-    # Path to the final configuration file
-    config_path = config.moduli_home / "moduli_generator.cnf"
-
-    # Ensure directory exists
-    config_dir = config_path.parent
-    config_dir.mkdir(parents=True, exist_ok=True)
+    # Path to the final configuration file; its directory is created at import
+    config_path = _DEFAULT_CNF_PATH
 
     # MariaDB.cnf HEADER
     hdr = "\n".join(
@@ -516,18 +1044,10 @@ def update_mariadb_app_owner(host, database, username, password) -> Path:
         }
     }
 
-    # Format the configuration file content
-    tmp_cnf = ""
-    for key, value in config_content.items():
-        tmp_cnf += f"[{key}]\n"
-        for k, v in value.items():
-            tmp_cnf += f"{k} = {v}\n"
-        tmp_cnf += "\n"
-
     # Write the configuration file
-    config_path.write_text("\n".join((hdr, tmp_cnf)))
+    _write_if_changed(config_path, "\n".join((hdr, build_cnf(config_content))))
 
-    print(f"Updated configuration file: {config_path}")
+    logger.info(f"Updated configuration file: {config_path}")
     return config_path
 
 
@@ -551,13 +1071,12 @@ def build_cnf(cnf_attrs: dict) -> str:
     Returns:
         str: A string representing the generated configuration (CNF) file content.
     """
-    local_cnf = ""
+    lines = []
     for key, value in cnf_attrs.items():
-        local_cnf += f"[{key}]\n"
-        for k, v in value.items():
-            local_cnf += f"{k} = {v}\n"
-        local_cnf += "\n"
-    return local_cnf
+        lines.append(f"[{key}]")
+        lines.extend(f"{k} = {v}" for k, v in value.items())
+        lines.append("")
+    return "".join(f"{line}\n" for line in lines)
 
 
 def create_moduli_generator_cnf(user: str, host: str, **kwargs: Dict[str, str]) -> Path:
@@ -587,12 +1106,9 @@ def create_moduli_generator_cnf(user: str, host: str, **kwargs: Dict[str, str])
             "host": host
         },
     }
-    for attr in kwargs:
-        cnf_attrs["client"][attr] = kwargs[attr]
+    cnf_attrs["client"].update(kwargs)
     # Create a new Random Password if not provided
-    if kwargs.get("password"):
-        cnf_attrs["client"]["password"] = kwargs.get("password")
-    else:  # Generate a random password
+    if not kwargs.get("password"):
         cnf_attrs["client"]["password"] = generate_random_password()
 
     # BUILD MariaDB.cnf HEADER
@@ -604,29 +1120,39 @@ def create_moduli_generator_cnf(user: str, host: str, **kwargs: Dict[str, str])
         )
     )
 
-    config.mariadb_cnf.write_text("\n".join((hdr, build_cnf(cnf_attrs))))
+    _write_if_changed(config.mariadb_cnf, "\n".join((hdr, build_cnf(cnf_attrs))))
     return config.mariadb_cnf
 
 
-def generate_random_password(length=default_config().password_length) -> str:
+def _write_if_changed(path: Path, text: str) -> bool:
     """
-    Generates a random password of the specified length, consisting of letters, digits,
-    and MariaDB-recommended safe special characters. This method uses cryptographically
-    secure random number generation to ensure unpredictability of the password.
-
-    Args:
-        length (int): The desired length of the generated password.
+    Writes `text` to `path` unless the file already holds exactly that text, so unchanged
+    cnf files keep their mtime (and the parsed-cnf cache entry keyed on it). The text is written
+    to an owner-only temporary file beside `path`, synced and renamed over it, so a crash never
+    leaves a truncated credentials file; the temporary file is removed if writing fails.
 
     Returns:
-        str: A randomly generated password containing letters, digits, and safe special characters.
+        bool: True if the file was written, False if it was already up to date.
     """
-    # Define character sets
-    letters_digits = string.ascii_letters + string.digits
-    # Include only MariaDB.com recommended safe special characters, excluding quotes and backslash
-    safe_punctuation = '+-*/,.,:;!?$%&@=^_~|<>()[]{}'
-    alphabet = letters_digits + safe_punctuation
-
-    # Generate the password using secrets module
-    password = ''.join(secrets.choice(alphabet) for _ in range(length))
-
-    return password
+    # Encoded once; the comparison reads raw bytes without decoding the existing file
+    data = text.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with open(fd, "wb") as tmp_file:
+            os.fchmod(fd, 0o600)
+            tmp_file.write(data)
+            tmp_file.flush()
+            # The data must be on disk before the rename makes it the only copy
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
@@ -6,9 +6,11 @@ Tests all functions and methods to achieve 95% test coverage.
 
 import os
 import shutil
+import sys
 import tempfile
 from datetime import datetime
-from logging import Logger
+from logging import Logger, NullHandler, StreamHandler
+from logging.handlers import QueueHandler
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -18,6 +20,7 @@ from config import (
     iso_utc_timestamp,
     strip_punction_from_datetime_str,
 )
+from config._logging import install_async_logging
 from db import is_valid_identifier_sql
 
 
@@ -351,6 +354,22 @@ class TestModuliConfig:
             # The directory should now exist (created by get_logger)
             assert config.moduli_home.exists()
 
+    @patch("config.basicConfig")
+    @patch("config.getLogger")
+    def test_get_logger_cached(self, mock_get_logger, mock_basic_config):
+        """Test get_logger configures logging once per config."""
+        mock_logger = MagicMock(spec=Logger)
+        mock_get_logger.return_value = mock_logger
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = ModuliConfig(base_dir=temp_dir)
+
+            assert config.get_logger() is config.get_logger() is mock_logger
+
+            # The second call returns the kept logger without repeating the setup
+            mock_basic_config.assert_called_once()
+            mock_get_logger.assert_called_once()
+
     def test_get_log_file_with_name(self):
         """Test get_log_file method with custom name."""
         config = ModuliConfig()
@@ -392,6 +411,62 @@ class TestModuliConfig:
         assert version == config.version
 
 
+class TestInstallAsyncLogging:
+    """Test cases for install_async_logging function."""
+
+    @patch("config._logging.atexit.register")
+    @patch("config._logging.getLogger")
+    def test_install_async_logging_writes_log_file(self, mock_get_logger, mock_register):
+        """Test records are queued and written to the log file by the listener."""
+        root = Logger("test_async_root")
+        mock_get_logger.return_value = root
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = ModuliConfig(base_dir=temp_dir).ensure_directories()
+
+            install_async_logging(config)
+            # The file is opened lazily, on the first record
+            assert not config.log_file.exists()
+            root.info("queued record")
+
+            # Stopping the listener drains the queue
+            listener = mock_register.call_args.args[0].__self__
+            listener.stop()
+            listener.handlers[0].close()
+
+            assert isinstance(root.handlers[0], QueueHandler)
+            assert "queued record" in config.log_file.read_text()
+
+    @patch("config._logging.atexit.register")
+    @patch("config._logging.getLogger")
+    def test_install_async_logging_configured_root(self, mock_get_logger, mock_register):
+        """Test nothing is installed when the root logger already has handlers."""
+        root = Logger("test_configured_root")
+        handler = NullHandler()
+        root.addHandler(handler)
+        mock_get_logger.return_value = root
+
+        install_async_logging(ModuliConfig())
+
+        assert root.handlers == [handler]
+        mock_register.assert_not_called()
+
+    @patch("config._logging.atexit.register")
+    @patch("config._logging.getLogger")
+    def test_install_async_logging_console(self, mock_get_logger, mock_register):
+        """Test console output adds one stderr handler beside the queue handler."""
+        root = Logger("test_console_root")
+        mock_get_logger.return_value = root
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            install_async_logging(ModuliConfig(base_dir=temp_dir), console=True)
+            install_async_logging(ModuliConfig(base_dir=temp_dir), console=True)
+            mock_register.call_args.args[0]()
+
+        assert [type(handler) for handler in root.handlers] == [QueueHandler, StreamHandler]
+        assert root.handlers[1].stream is sys.stderr
+
+
 class TestDefaultConfig:
     """Test cases for default_config module-level instance."""
 
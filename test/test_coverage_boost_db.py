@@ -162,6 +162,34 @@ class TestDatabaseCoverageBoost:
 
             assert result is False
 
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    @patch("db.is_valid_identifier_sql")
+    def test_add_validates_identifiers_once(
+        self, mock_is_valid, mock_pool, mock_parse_config, valid_mock_config
+    ):
+        """Test identifiers are validated at construction, not on every add."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "test",
+                "password": "test",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        mock_pool.return_value = MagicMock()
+        mock_is_valid.return_value = True
+
+        connector = MariaDBConnector(valid_mock_config)
+        calls_after_init = mock_is_valid.call_count
+
+        connector.add(20231201000000, 4096, "test_modulus_1")
+        connector.add(20231201000001, 4096, "test_modulus_2")
+
+        assert calls_after_init == 3
+        assert mock_is_valid.call_count == calls_after_init
+
     @patch("db.parse_mysql_config")
     @patch("db.ConnectionPool")
     @patch("db.is_valid_identifier_sql")
@@ -5,13 +5,17 @@ This module tests the MariaDBConnector class and related database operations,
 including connection management, SQL execution, and moduli storage operations.
 """
 
+import hashlib
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
 
 import mariadb
 import pytest
+from mariadb.constants import CLIENT
 
+from config import DEFAULT_KEY_LENGTHS
 from db import MariaDBConnector, get_mysql_config_value, parse_mysql_config
+from db.errors import QueryError
 
 
 class TestMariaDBConfigParsing:
@@ -553,6 +557,38 @@ class TestMariaDBConnectorSQLExecution:
 
         assert mock_cursor.execute.call_count == 2
 
+    @pytest.mark.integration
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_execute_batch_prepares_each_statement_once(
+            self, mock_pool, mock_parse_config, mock_config
+    ):
+        """Test execute_batch reuses one prepared cursor per distinct parameterized query."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connection_pool = MagicMock()
+        mock_connection_pool.get_connection.return_value = mock_connection
+        mock_pool.return_value = mock_connection_pool
+
+        connector = MariaDBConnector(mock_config)
+        queries = ["INSERT INTO test_table VALUES (?)"] * 3
+        params_list = [("value1",), ("value2",), ("value3",)]
+
+        connector.execute_batch(queries, params_list)
+
+        mock_connection.cursor.assert_called_once_with(prepared=True)
+        assert mock_cursor.execute.call_count == 3
+
 
 class TestMariaDBConnectorModuliOperations:
     """Test cases for moduli-specific database operations."""
@@ -615,6 +651,154 @@ class TestMariaDBConnectorModuliOperations:
         # add_batch uses execute_batch which calls execute() multiple times
         assert mock_cursor.execute.call_count == len(records)
 
+    @pytest.mark.integration
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_add_with_invalid_view_name(self, mock_pool, mock_parse_config, mock_config):
+        """Test an invalid view name does not block inserts, which only use the table."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.lastrowid = 1
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connection_pool = MagicMock()
+        mock_connection_pool.get_connection.return_value = mock_connection
+        mock_pool.return_value = mock_connection_pool
+        mock_config.view_name = "moduli-view; DROP TABLE moduli"
+
+        connector = MariaDBConnector(mock_config)
+
+        assert connector.add(20231201000000, 4096, "test_modulus") == 1
+        assert connector.add_batch([(20231201000001, 4096, "test_modulus_2")])
+        assert mock_cursor.execute.call_count == 2
+
+    @pytest.mark.integration
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_add_batch_computes_modulus_hash(self, mock_pool, mock_parse_config, mock_config):
+        """Test add_batch supplies the client-side SHA-512 of each modulus."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connection_pool = MagicMock()
+        mock_connection_pool.get_connection.return_value = mock_connection
+        mock_pool.return_value = mock_connection_pool
+
+        connector = MariaDBConnector(mock_config)
+        connector.add_batch([(20231201000000, 4096, "test_modulus_1")])
+
+        query, params = mock_cursor.execute.call_args[0]
+        assert "modulus_hash" in query
+        assert params[4] == hashlib.sha512(b"test_modulus_1").digest()
+
+    @pytest.mark.integration
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_load_batch_moduli(self, mock_pool, mock_parse_config, mock_connect, mock_config):
+        """Test bulk loading moduli with a single LOAD DATA LOCAL INFILE statement."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 2
+        mock_cursor.warnings = 0
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        connector = MariaDBConnector(mock_config)
+        records = [
+            (20231201000000, 4096, "test_modulus_1"),
+            (20231201000001, 4096, "test_modulus_2"),
+        ]
+
+        assert connector.load_batch(records) == 2
+        # Without warnings there is nothing to read back
+        assert mock_cursor.execute.call_count == 1
+        query = mock_cursor.execute.call_args[0][0]
+        assert query.startswith("LOAD DATA LOCAL INFILE")
+        assert "IGNORE INTO TABLE test_moduli_db.test_moduli_table" in query
+        # Only the dedicated bulk load connection accepts LOCAL INFILE requests
+        assert mock_connect.call_args.kwargs["local_infile"] is True
+        assert "local_infile" not in mock_pool.call_args.kwargs
+        mock_connection.close.assert_called_once()
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize(
+        "warnings, shown, loaded",
+        [
+            (1, [("Warning", 1062, "Duplicate entry")], True),
+            (2, [("Warning", 1062, "Duplicate entry"), ("Warning", 1366, "Incorrect integer value")], False),
+            (2, [("Warning", 1062, "Duplicate entry")], False),
+        ],
+        ids=["duplicates", "rejected_row", "unchecked_warnings"],
+    )
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_load_batch_warnings(
+            self, mock_pool, mock_parse_config, mock_connect, mock_config, warnings, shown, loaded
+    ):
+        """Test a bulk load commits when it only skipped duplicates and rolls back otherwise."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        mock_connection = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 1
+        mock_cursor.warnings = warnings
+        mock_cursor.fetchall.return_value = shown
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connect.return_value = mock_connection
+
+        connector = MariaDBConnector(mock_config)
+        records = [
+            (20231201000000, 4096, "test_modulus_1"),
+            (20231201000001, 4096, "test_modulus_1"),
+        ]
+
+        if loaded:
+            assert connector.load_batch(records) == 1
+            mock_connection.commit.assert_called_once()
+        else:
+            with pytest.raises(QueryError):
+                connector.load_batch(records)
+            mock_connection.commit.assert_not_called()
+            mock_connection.rollback.assert_called_once()
+        assert mock_cursor.execute.call_args_list[1].args == ("SHOW WARNINGS",)
+        # Every warning of the load is kept for SHOW WARNINGS
+        assert "max_error_count" in mock_connect.call_args.kwargs["init_command"]
+
     @pytest.mark.integration
     @patch("db.parse_mysql_config")
     @patch("db.ConnectionPool")
@@ -786,6 +970,75 @@ class TestMariaDBConnectorExportOperations:
         # Verify the operation was successful
         assert result == 0
 
+    @pytest.mark.integration
+    @patch("db.DEFAULT_BULK_LOAD_THRESHOLD", 2)
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_export_screened_moduli_infile_disabled(
+            self, mock_pool, mock_parse_config, mock_connect, mock_config
+    ):
+        """Test large exports fall back to executemany when LOCAL INFILE is disabled."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        infile_disabled = mariadb.Error("The used command is not allowed with this MariaDB version")
+        infile_disabled.errno = 4166
+        mock_connect.return_value.cursor.return_value.__enter__.return_value.execute.side_effect = (
+            infile_disabled
+        )
+        mock_cursor = MagicMock()
+        mock_cursor.rowcount = 2
+        mock_connection = MagicMock()
+        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_pool.return_value.get_connection.return_value = mock_connection
+
+        connector = MariaDBConnector(mock_config)
+        screened_moduli = {
+            4096: [
+                {"timestamp": 20231201000000, "key-size": 4096, "modulus": "modulus1"},
+                {"timestamp": 20231201000001, "key-size": 4096, "modulus": "modulus2"},
+            ],
+        }
+
+        assert connector.export_screened_moduli(screened_moduli) == 0
+        query, params = mock_cursor.executemany.call_args[0]
+        assert query.startswith("INSERT IGNORE INTO test_moduli_db.test_moduli_table")
+        assert [row[3] for row in params] == ["modulus1", "modulus2"]
+
+    @pytest.mark.integration
+    @patch("db.DEFAULT_BULK_LOAD_THRESHOLD", 1)
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_export_screened_moduli_invalid_identifiers(
+            self, mock_pool, mock_parse_config, mock_connect, mock_config
+    ):
+        """Test a bulk export with an invalid table name reports failure."""
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        connector = MariaDBConnector(mock_config)
+        connector._table_identifiers_valid = False
+        screened_moduli = {
+            4096: [{"timestamp": 20231201000000, "key-size": 4096, "modulus": "modulus1"}],
+        }
+
+        assert connector.export_screened_moduli(screened_moduli) == 1
+        mock_connect.assert_not_called()
+
     @pytest.mark.integration
     @patch("db.parse_mysql_config")
     @patch("db.ConnectionPool")
@@ -838,6 +1091,51 @@ class TestMariaDBConnectorExportOperations:
             mock_file.assert_called()
             mock_cursor.execute.assert_called()
 
+    @pytest.mark.integration
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_write_moduli_file_indexed_sampling(
+        self, mock_pool, mock_parse_config, mock_config
+    ):
+        """Test write_moduli_file samples by `sample_id` range instead of ORDER BY RAND()."""
+        from datetime import datetime
+
+        mock_parse_config.return_value = {
+            "client": {
+                "user": "testuser",
+                "password": "testpass",
+                "host": "localhost",
+                "port": "3306",
+                "database": "testdb",
+            }
+        }
+        mock_pool.return_value = MagicMock()
+
+        with patch("builtins.open", mock_open()):
+            connector = MariaDBConnector(mock_config)
+            connector.records_per_keylength = 2
+            connector.moduli_home = Path("/tmp")
+            connector.db_name = "test_db"
+            connector.view_name = "test_view"
+            connector.execute_select = MagicMock(
+                return_value=[
+                    {
+                        "timestamp": datetime(2023, 12, 1, 0, 0, i),
+                        "size": 4095,
+                        "modulus": f"test_modulus_{i}",
+                        "sample_id": i,
+                    }
+                    for i in range(3)
+                ]
+            )
+
+            connector.write_moduli_file()
+
+        query, params = connector.execute_select.call_args[0]
+        assert "RAND()" not in query
+        assert "ORDER BY sample_id LIMIT %s" in query
+        assert len(params) == 6 * len(DEFAULT_KEY_LENGTHS)
+
 
 class TestMariaDBConnectorErrorHandling:
     """Test cases for database error handling."""
@@ -927,3 +1225,163 @@ class TestMariaDBConnectorErrorHandling:
         with pytest.raises(RuntimeError):
             with connector.get_connection():
                 pass
+
+
+class TestMariaDBConnectorScriptExecution:
+    """Test cases for executing ordered statement scripts on the multi-statement connection."""
+
+    @staticmethod
+    def _script_connection(server_version=100600):
+        """Returns a mocked connection whose text and binary cursors are kept apart."""
+        connection = MagicMock()
+        connection.server_version = server_version
+        connection.escape_string.side_effect = lambda value: value.replace("'", "\\'")
+        text_cursor, binary_cursor = MagicMock(), MagicMock()
+        text_cursor.nextset.return_value = None
+
+        def cursor(binary=False):
+            context = MagicMock()
+            context.__enter__.return_value = binary_cursor if binary else text_cursor
+            return context
+
+        connection.cursor.side_effect = cursor
+        return connection, text_cursor, binary_cursor
+
+    @pytest.mark.integration
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_execute_script_groups_statements(
+            self, mock_pool, mock_parse_config, mock_connect, mock_config
+    ):
+        """Test parameterless runs share a packet and repeated parameterized statements use executemany."""
+        mock_parse_config.return_value = {
+            "client": {"user": "testuser", "password": "testpass", "host": "localhost"}
+        }
+        connection, text_cursor, binary_cursor = self._script_connection()
+        mock_connect.return_value = connection
+
+        connector = MariaDBConnector(mock_config)
+        assert connector.execute_script([
+            ("CREATE DATABASE x;", None),
+            ("CREATE TABLE x.y (a INT)", None),
+            ("INSERT INTO x.y VALUES (%s)", (1,)),
+            ("INSERT INTO x.y VALUES (%s)", (2,)),
+            ("CREATE INDEX i ON x.y (a)", None),
+            ("INSERT INTO x.y VALUES (%s)", (3,)),
+        ]) is True
+
+        assert [call.args for call in text_cursor.execute.call_args_list] == [
+            ("CREATE DATABASE x;\nCREATE TABLE x.y (a INT)",),
+            ("CREATE INDEX i ON x.y (a)",),
+        ]
+        binary_cursor.executemany.assert_called_once_with("INSERT INTO x.y VALUES (%s)", [(1,), (2,)])
+        binary_cursor.execute.assert_called_once_with("INSERT INTO x.y VALUES (%s)", (3,))
+        # The statement is prepared on one binary cursor for the whole script
+        assert [call.kwargs for call in connection.cursor.call_args_list].count({"binary": True}) == 1
+        connection.commit.assert_called_once()
+
+    @pytest.mark.integration
+    @pytest.mark.parametrize(
+        "server_version, inline_params", [(100100, False), (100600, True)]
+    )
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_execute_script_interpolates_parameters(
+            self, mock_pool, mock_parse_config, mock_connect, server_version, inline_params, mock_config
+    ):
+        """Test pre-10.2 servers, and inline_params, fold escaped parameters into one packet."""
+        mock_parse_config.return_value = {
+            "client": {"user": "testuser", "password": "testpass", "host": "localhost"}
+        }
+        connection, text_cursor, binary_cursor = self._script_connection(server_version)
+        mock_connect.return_value = connection
+
+        connector = MariaDBConnector(mock_config)
+        connector.execute_script(
+            [
+                ("CREATE TABLE x.y (a INT, b TEXT, c TEXT, d BLOB)", None),
+                ("INSERT INTO x.y VALUES (%s, %s, %s, %s)", (1, "a'b", None, b"\x01")),
+            ],
+            inline_params=inline_params,
+        )
+
+        text_cursor.execute.assert_called_once_with(
+            "CREATE TABLE x.y (a INT, b TEXT, c TEXT, d BLOB);\n"
+            "INSERT INTO x.y VALUES (1, 'a\\'b', NULL, X'01')"
+        )
+        binary_cursor.execute.assert_not_called()
+        binary_cursor.executemany.assert_not_called()
+
+    def test_interpolate_skips_quoted_and_commented_placeholders(self):
+        """Test only placeholders outside strings, quoted identifiers and comments are substituted."""
+        connection = MagicMock()
+        connection.escape_string.side_effect = lambda value: value.replace("'", "\\'")
+
+        statement = MariaDBConnector._interpolate(
+            connection,
+            "INSERT INTO x.`y%s` VALUES (%s, '%s', \"it's %s\", %s) -- %s\n/* %s */ # %s\n",
+            (1, "a'b"),
+        )
+
+        assert statement == (
+            "INSERT INTO x.`y%s` VALUES (1, '%s', \"it's %s\", 'a\\'b') -- %s\n/* %s */ # %s\n"
+        )
+
+    def test_interpolate_counts_only_live_placeholders(self):
+        """Test a parameter count matching the raw `%s` count but not the placeholders is rejected."""
+        with pytest.raises(ValueError, match="Expected 1 parameters, got 2"):
+            MariaDBConnector._interpolate(MagicMock(), "SELECT '%s', %s", (1, 2))
+
+    @pytest.mark.parametrize("value", [float("nan"), float("inf"), float("-inf")])
+    def test_interpolate_rejects_non_finite_floats(self, value):
+        """Test NaN and infinities, which have no SQL literal, are rejected."""
+        with pytest.raises(ValueError, match="non-finite"):
+            MariaDBConnector._interpolate(MagicMock(), "SELECT %s", (value,))
+
+    @pytest.mark.integration
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_multi_statement_connection_is_reused(
+            self, mock_pool, mock_parse_config, mock_connect, mock_config
+    ):
+        """Test the dedicated multi-statement connection is opened once per connector."""
+        mock_parse_config.return_value = {
+            "client": {"user": "testuser", "password": "testpass", "host": "localhost"}
+        }
+        mock_connect.return_value = self._script_connection()[0]
+
+        connector = MariaDBConnector(mock_config)
+        connector.execute_script([("CREATE DATABASE x", None)])
+        connector.execute_script([("CREATE DATABASE y", None)])
+
+        mock_connect.assert_called_once()
+        assert mock_connect.call_args.kwargs["client_flag"] == CLIENT.MULTI_STATEMENTS
+
+    @pytest.mark.integration
+    @patch("db.connect")
+    @patch("db.parse_mysql_config")
+    @patch("db.ConnectionPool")
+    def test_multi_statement_connection_is_discarded_after_error(
+            self, mock_pool, mock_parse_config, mock_connect, mock_config
+    ):
+        """Test a driver error rolls back, closes the connection and reconnects on the next script."""
+        mock_parse_config.return_value = {
+            "client": {"user": "testuser", "password": "testpass", "host": "localhost"}
+        }
+        failed, failed_cursor, _ = self._script_connection()
+        failed_cursor.execute.side_effect = mariadb.Error("Lost connection to server")
+        healthy = self._script_connection()[0]
+        mock_connect.side_effect = [failed, healthy]
+
+        connector = MariaDBConnector(mock_config)
+        with pytest.raises(QueryError):
+            connector.execute_script([("CREATE DATABASE x", None)])
+        failed.rollback.assert_called_once()
+        failed.close.assert_called_once()
+
+        assert connector.execute_script([("CREATE DATABASE x", None)]) is True
+        assert mock_connect.call_count == 2
+        healthy.commit.assert_called_once()
@@ -0,0 +1,45 @@
+"""
+Tests for the password generator used for the `moduli_generator` database account.
+
+This module tests the length of generated passwords and that every character is safe to store in
+a MariaDB option file.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from config import CONST_MARIADB_PASSWORD_LENGTH
+from db.scripts._password import ALPHABET, generate_random_password
+
+
+class TestGenerateRandomPassword:
+    """Test cases for generate_random_password."""
+
+    def test_default_length(self):
+        """Test the default password length is the configured MariaDB password length."""
+        assert len(generate_random_password()) == CONST_MARIADB_PASSWORD_LENGTH
+
+    @pytest.mark.parametrize("length", [1, 7, 64, 1000])
+    def test_length(self, length):
+        """Test passwords have exactly the requested length."""
+        assert len(generate_random_password(length)) == length
+
+    def test_zero_length(self):
+        """Test a zero length gives an empty password."""
+        assert generate_random_password(length=0) == ""
+
+    def test_characters_come_from_alphabet(self):
+        """Test every character is in ALPHABET, which leaves out option-file comment and quote characters."""
+        password = generate_random_password(4096)
+
+        assert set(password.encode()) <= set(ALPHABET)
+        assert not set(b"#'\"\\") & set(ALPHABET)
+
+    def test_rejected_bytes_are_redrawn(self):
+        """Test bytes that would bias the alphabet are dropped and more are drawn."""
+        # 255 is always rejected, so the first draw yields nothing
+        draws = iter([b"\xff" * 8, bytes(range(8))])
+
+        with patch("db.scripts._password.secrets.token_bytes", side_effect=lambda n: next(draws)):
+            assert generate_random_password(4) == ALPHABET[:4].decode()
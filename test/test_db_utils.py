@@ -0,0 +1,401 @@
+"""
+Tests for the schema installation helpers in db.utils.
+
+This module tests the schema statements, the migration of tables created by earlier
+releases, and the installer modes.
+"""
+
+import io
+import os
+import stat
+from functools import partial
+from pathlib import Path
+from unittest.mock import DEFAULT, MagicMock, patch
+
+import pytest
+
+from db.errors import QueryError
+from db.utils import (
+    InstallSchema,
+    _iter_sql_statements,
+    _iter_sql_statements_stream,
+    _write_if_changed,
+    cnf_argparser,
+    get_moduli_generator_db_schema_statements,
+    get_moduli_generator_schema_statements,
+    get_moduli_generator_user_schema_statements,
+)
+
+
+# `modulus_hash` as information_schema.COLUMNS describes it for each table shape
+_BASELINE_HASH_COLUMN = {"DATA_TYPE": "varchar", "GENERATION_EXPRESSION": "sha2(`modulus`,512)"}
+_CURRENT_HASH_COLUMN = {"DATA_TYPE": "binary", "GENERATION_EXPRESSION": None}
+
+
+def _information_schema(columns):
+    """Returns a `sql` side effect answering the legacy-table query from `columns`, by table."""
+
+    def sql(query, params=None, fetch=False):
+        if "information_schema.COLUMNS" not in query:
+            return DEFAULT
+        assert "GENERATION_EXPRESSION IS NOT NULL OR DATA_TYPE IN ('char', 'varchar')" in query
+        return [
+            {"TABLE_NAME": table}
+            for table, column in columns.items()
+            if column["GENERATION_EXPRESSION"] is not None or column["DATA_TYPE"] in ("char", "varchar")
+        ]
+
+    return sql
+
+
+def _installer(columns=None, statements=get_moduli_generator_db_schema_statements):
+    db = MagicMock()
+    db.sql.return_value = [{"Grants": "GRANT ALL PRIVILEGES ON *.* TO `admin`@`localhost`"}]
+    db.sql.side_effect = _information_schema(columns or {})
+    return InstallSchema(db, statements, "moduli_db")
+
+
+def _executed(install):
+    return [" ".join(query.split()) for call in install.db.execute_script.call_args_list for query, _ in call.args[0]]
+
+
+class TestSchemaMigration:
+    """Test cases for migrating tables created with the legacy DDL."""
+
+    def test_schema_statements_do_not_migrate(self):
+        """Test the CREATE TABLE path carries no ALTER TABLE or UPDATE statements."""
+        queries = [statement.query.strip() for statement in get_moduli_generator_db_schema_statements("moduli_db")]
+
+        assert not any(query.startswith(("ALTER TABLE", "UPDATE")) for query in queries)
+
+    def test_current_schema_is_not_rebuilt(self):
+        """Test an up-to-date schema costs one information_schema query and no migration."""
+        install = _installer({"moduli": _CURRENT_HASH_COLUMN, "moduli_archive": _CURRENT_HASH_COLUMN})
+
+        assert install.install_schema_batch() is True
+
+        assert not any(query.startswith(("ALTER TABLE", "UPDATE")) for query in _executed(install))
+
+    def test_baseline_moduli_migration(self):
+        """Test a baseline moduli table is migrated before the schema, which indexes sample_id."""
+        install = _installer({"moduli": _BASELINE_HASH_COLUMN, "moduli_archive": _CURRENT_HASH_COLUMN})
+
+        assert install.install_schema_batch() is True
+
+        executed = _executed(install)
+        assert executed[:4] == [
+            "ALTER TABLE moduli_db.moduli ADD COLUMN IF NOT EXISTS sample_id BIGINT UNSIGNED NOT NULL DEFAULT 0 "
+            "COMMENT 'Random key for indexed sampling', MODIFY modulus_hash VARBINARY(128) NOT NULL",
+            "UPDATE moduli_db.moduli SET modulus_hash = UNHEX(SHA2(modulus, 512)) WHERE LENGTH(modulus_hash) <> 64",
+            "UPDATE moduli_db.moduli SET sample_id = FLOOR(RAND() * POW(2, 63)) WHERE sample_id = 0",
+            "ALTER TABLE moduli_db.moduli MODIFY modulus_hash BINARY(64) NOT NULL "
+            "COMMENT 'SHA-512 of modulus, computed by the client'",
+        ]
+        assert not any("moduli_archive" in query for query in executed[:4])
+        assert executed.index("CREATE INDEX IF NOT EXISTS idx_size_sample ON moduli_db.moduli(size, sample_id)") > 3
+
+    def test_baseline_archive_migration(self):
+        """Test a baseline archive's generated hex hash is widened, rewritten as the digest, then narrowed."""
+        install = _installer({"moduli": _CURRENT_HASH_COLUMN, "moduli_archive": _BASELINE_HASH_COLUMN})
+
+        assert install.install_schema_batch() is True
+
+        assert _executed(install)[:3] == [
+            "ALTER TABLE moduli_db.moduli_archive MODIFY modulus_hash VARBINARY(128) NOT NULL",
+            "UPDATE moduli_db.moduli_archive SET modulus_hash = UNHEX(SHA2(modulus, 512)) "
+            "WHERE LENGTH(modulus_hash) <> 64",
+            "ALTER TABLE moduli_db.moduli_archive MODIFY modulus_hash BINARY(64) NOT NULL "
+            "COMMENT 'SHA-512 of modulus, computed by the client'",
+        ]
+
+    @pytest.mark.parametrize(
+        "mode", ["install_schema", "install_schema_batch", "install_schema_parallel", "install_schema_file"]
+    )
+    def test_every_mode_migrates(self, mode, tmp_path):
+        """Test every install mode migrates legacy tables before the schema."""
+        install = _installer({"moduli": _BASELINE_HASH_COLUMN, "moduli_archive": _BASELINE_HASH_COLUMN})
+        install.db.clone.return_value.__enter__.return_value = install.db
+        schema_file = tmp_path / "schema.sql"
+        schema_file.write_text("CREATE DATABASE IF NOT EXISTS moduli_db;")
+
+        args = (schema_file,) if mode == "install_schema_file" else ()
+        assert getattr(install, mode)(*args) is True
+
+        migration = install.db.execute_script.call_args_list[0].args[0]
+        assert [query.split()[0] for query, _ in migration] == [
+            "ALTER", "UPDATE", "UPDATE", "ALTER", "ALTER", "UPDATE", "ALTER"
+        ]
+
+    def test_invalid_database_name(self):
+        """Test an invalid database name is rejected before any statement is built."""
+        with pytest.raises(ValueError, match="Invalid database name"):
+            get_moduli_generator_db_schema_statements("moduli db;")
+
+
+def _batch_installer():
+    return _installer(statements=partial(get_moduli_generator_schema_statements, password="secret"))
+
+
+def _query_error(errno):
+    cause = Exception("statement failed")
+    cause.errno = errno
+    try:
+        raise QueryError("Script execution failed") from cause
+    except QueryError as err:
+        return err
+
+
+class TestInstallSchemaBatch:
+    """Test cases for the batch mode schema installer."""
+
+    def test_privileged_statements_are_inlined(self):
+        """Test account statements run as their own packet with client-side parameters."""
+        install = _batch_installer()
+
+        assert install.install_schema_batch() is True
+
+        (schema_call, account_call) = install.db.execute_script.call_args_list
+        assert not any(query.startswith(("CREATE USER", "ALTER USER")) for query, _ in schema_call.args[0])
+        assert account_call.kwargs == {"inline_params": True}
+        assert all(query.startswith(("CREATE USER", "ALTER USER", "GRANT", "FLUSH"))
+                   for query, _ in account_call.args[0])
+
+    def test_no_batch_sends_one_statement_at_a_time(self):
+        """Test the non-batch install sends every statement on its own, account statements last."""
+        install = _batch_installer()
+
+        assert install.install_schema() is True
+
+        install.db.execute_script.assert_not_called()
+        # SHOW GRANTS, the legacy-table query, then every statement individually
+        sent = [call.args[0] for call in install.db.sql.call_args_list[2:]]
+        assert len(sent) == len(install.schema_statements)
+        assert sent[-1].startswith("GRANT")
+
+    def test_falls_back_when_multi_statements_unsupported(self):
+        """Test a parse error of the joined packet re-runs the statements one at a time."""
+        install = _batch_installer()
+        install.db.execute_script.side_effect = _query_error(1064)
+
+        assert install.install_schema_batch() is True
+        # SHOW GRANTS, the legacy-table query, then every statement individually
+        assert install.db.sql.call_count == 2 + len(install.schema_statements)
+
+    def test_other_errors_do_not_fall_back(self):
+        """Test a statement failure is reported instead of re-running the schema."""
+        install = _batch_installer()
+        install.db.execute_script.side_effect = _query_error(1142)
+
+        assert install.install_schema_batch() is False
+        assert install.db.sql.call_count == 2
+
+    def test_parallel_account_statements_run_as_one_packet(self):
+        """Test the parallel installer sends the account statements last, with inlined parameters."""
+        install = _batch_installer()
+        install.db.clone.return_value.__enter__.return_value = install.db
+
+        assert install.install_schema_parallel() is True
+
+        sent = [call.args[0] for call in install.db.sql.call_args_list]
+        assert not any(query.startswith(("CREATE USER", "ALTER USER", "GRANT")) for query in sent)
+        (account_call,) = install.db.execute_script.call_args_list
+        assert account_call.kwargs == {"inline_params": True}
+        assert account_call.args[0][0][0].startswith("CREATE USER")
+
+
+class TestSqlStatementSplitter:
+    """Test cases for splitting schema files into statements."""
+
+    def test_semicolons_inside_strings_comments_and_backticks(self):
+        """Test only top-level `;` ends a statement."""
+        content = (
+            b"INSERT INTO t VALUES ('a;b', \"c;d\", 'it\\'s;');\n"
+            b"SELECT `odd;name` FROM t -- trailing; comment\n;\n"
+            b"/* block; comment */ SELECT 1 - 2 / 3 # hash; comment\n;"
+        )
+        expected = [
+            "INSERT INTO t VALUES ('a;b', \"c;d\", 'it\\'s;')",
+            "SELECT `odd;name` FROM t -- trailing; comment",
+            "/* block; comment */ SELECT 1 - 2 / 3 # hash; comment",
+        ]
+
+        assert list(_iter_sql_statements(content)) == expected
+        assert list(_iter_sql_statements_stream(io.BytesIO(content))) == expected
+
+    def test_comment_only_statements_are_skipped(self):
+        """Test empty statements and statements made only of comments are not yielded."""
+        content = b"-- header;\n;; /* nothing */ ;\nSELECT 1;\n# footer"
+
+        assert list(_iter_sql_statements(content)) == ["SELECT 1"]
+        assert list(_iter_sql_statements_stream(io.BytesIO(content))) == ["SELECT 1"]
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13])
+    def test_statement_split_across_chunks(self, chunk_size):
+        """Test quotes, comments and operators cut by a chunk boundary split like a single buffer."""
+        content = (
+            b"CREATE TABLE t (a INT); INSERT INTO t VALUES ('x;\\'y'); "
+            b"SELECT 4 - 2 /* c;d */ / 1 -- e;f\n; SELECT `g;h`"
+        )
+
+        statements = list(_iter_sql_statements_stream(io.BytesIO(content), chunk_size=chunk_size))
+
+        assert statements == list(_iter_sql_statements(content))
+        assert len(statements) == 4
+
+    def test_schema_file_splits_identically(self):
+        """Test the streaming splitter agrees with the mapped splitter on the packaged schema."""
+        content = (Path(__file__).parent.parent / "data" / "schema" / "ssh_moduli_schema.sql").read_bytes()
+
+        assert list(_iter_sql_statements_stream(io.BytesIO(content), chunk_size=97)) == list(
+            _iter_sql_statements(content)
+        )
+
+    @pytest.mark.parametrize("content", [b"SELECT 1; SELECT 'a;b", b"SELECT 1; /* a;b", b'SELECT "a'])
+    def test_unterminated_input(self, content):
+        """Test a quote or comment left open at the end of the input is an error."""
+        with pytest.raises(ValueError, match="Unterminated"):
+            list(_iter_sql_statements(content))
+        with pytest.raises(ValueError, match="Unterminated"):
+            list(_iter_sql_statements_stream(io.BytesIO(content), chunk_size=4))
+
+
+class TestUserSchemaStatements:
+    """Test cases for the `moduli_generator` account statements."""
+
+    def test_password_is_required(self):
+        """Test the caller must supply the password it will store in the cnf file."""
+        with pytest.raises(TypeError):
+            get_moduli_generator_user_schema_statements("moduli_db")
+
+    def test_password_is_a_parameter(self):
+        """Test the password is passed as a statement parameter, never formatted into the query."""
+        statements = get_moduli_generator_user_schema_statements("moduli_db", password="s3cr'et")
+
+        assert not any("s3cr'et" in statement.query for statement in statements)
+        assert {param for statement in statements for param in statement.params or ()} == {"s3cr'et"}
+
+
+class TestCheckPrivileges:
+    """Test cases for the privilege check run before every install mode."""
+
+    def test_role_grants_are_inconclusive(self, caplog):
+        """Test privileges that may come from a role are warned about instead of failing the install."""
+        install = _batch_installer()
+        install.db.sql.return_value = [
+            {"Grants": "GRANT `schema_admin` TO `admin`@`localhost`"},
+            {"Grants": "GRANT USAGE ON *.* TO `admin`@`localhost`"},
+        ]
+
+        assert install._check_privileges() is True
+        assert "Cannot confirm privileges on moduli_db" in caplog.text
+
+    def test_no_grant_on_the_database_is_inconclusive(self, caplog):
+        """Test grant lines that match no scope are warned about instead of failing the install."""
+        install = _batch_installer()
+        install.db.sql.return_value = [{"Grants": "GRANT SELECT ON `other_db`.* TO `admin`@`localhost`"}]
+
+        assert install._check_privileges() is True
+        assert "Cannot confirm privileges on moduli_db" in caplog.text
+
+    def test_missing_privileges(self, caplog):
+        """Test direct grants that lack a needed privilege fail the check."""
+        install = _batch_installer()
+        install.db.sql.return_value = [
+            {"Grants": "GRANT CREATE USER ON *.* TO `admin`@`localhost`"},
+            {"Grants": "GRANT SELECT ON `moduli_db`.* TO `admin`@`localhost`"},
+        ]
+
+        assert install._check_privileges() is False
+        assert "Missing privileges on moduli_db" in caplog.text
+
+    def test_escaped_database_name(self):
+        """Test the backslash escapes SHOW GRANTS prints in database names are removed before matching."""
+        install = _batch_installer()
+        install.db.sql.return_value = [
+            {"Grants": "GRANT CREATE USER ON *.* TO `admin`@`localhost`"},
+            {"Grants": "GRANT CREATE, ALTER, INDEX, INSERT, SELECT, UPDATE, CREATE VIEW "
+                       "ON `moduli\\_db`.* TO `admin`@`localhost`"},
+        ]
+
+        assert install._check_privileges() is True
+
+    def test_direct_grants_on_the_database(self):
+        """Test grants on the target database satisfy the check, whatever other lines say."""
+        install = _batch_installer()
+        install.db.sql.return_value = [
+            {"Grants": "GRANT `schema_admin` TO `admin`@`localhost`"},
+            {"Grants": "GRANT CREATE USER ON *.* TO `admin`@`localhost`"},
+            {"Grants": "GRANT CREATE, ALTER, INDEX, INSERT, SELECT, UPDATE, CREATE VIEW "
+                       "ON `moduli_db`.* TO `admin`@`localhost`"},
+        ]
+
+        assert install._check_privileges() is True
+
+    def test_parallel_install_checks_privileges(self):
+        """Test the parallel installer stops before cloning the connector when grants are missing."""
+        install = _batch_installer()
+        install.db.sql.return_value = [{"Grants": "GRANT USAGE ON *.* TO `admin`@`localhost`"}]
+
+        assert install.install_schema_parallel() is False
+        install.db.clone.assert_not_called()
+
+
+class TestWriteIfChanged:
+    """Test cases for writing cnf files atomically."""
+
+    def test_writes_new_file_owner_only(self, tmp_path):
+        """Test a new file is written with mode 0o600 and no temporary file is left behind."""
+        path = tmp_path / "moduli_generator.cnf"
+
+        assert _write_if_changed(path, "[client]\n") is True
+
+        assert path.read_text() == "[client]\n"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_unchanged_content_is_not_rewritten(self, tmp_path):
+        """Test identical content leaves the file, and its mtime, untouched."""
+        path = tmp_path / "moduli_generator.cnf"
+        _write_if_changed(path, "[client]\n")
+        os.utime(path, ns=(0, 0))
+
+        assert _write_if_changed(path, "[client]\n") is False
+        assert path.stat().st_mtime_ns == 0
+
+    def test_changed_content_replaces_file(self, tmp_path):
+        """Test changed content replaces a world-readable file with an owner-only one."""
+        path = tmp_path / "moduli_generator.cnf"
+        path.write_text("[client]\nuser = old\n")
+        path.chmod(0o644)
+
+        assert _write_if_changed(path, "[client]\nuser = new\n") is True
+
+        assert path.read_text() == "[client]\nuser = new\n"
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    def test_failed_write_removes_temporary_file(self, tmp_path):
+        """Test a failure before the rename keeps the old file and removes the temporary file."""
+        path = tmp_path / "moduli_generator.cnf"
+        path.write_text("[client]\n")
+
+        with patch("db.utils.os.fsync", side_effect=OSError("disk full")):
+            with pytest.raises(OSError, match="disk full"):
+                _write_if_changed(path, "[client]\nuser = new\n")
+
+        assert path.read_text() == "[client]\n"
+        assert list(tmp_path.iterdir()) == [path]
+
+
+class TestCnfArgparser:
+    """Test cases for the schema installer command line."""
+
+    @pytest.mark.parametrize("size", ["1", "64"])
+    def test_pool_size_in_range(self, size):
+        """Test pool sizes from 1 to 64 are accepted."""
+        assert cnf_argparser().parse_args(["--pool-size", size]).pool_size == int(size)
+
+    @pytest.mark.parametrize("size", ["0", "-1", "65", "many"])
+    def test_pool_size_out_of_range(self, size):
+        """Test pool sizes the connection pool cannot use are rejected by the parser."""
+        with pytest.raises(SystemExit):
+            cnf_argparser().parse_args(["--pool-size", size])